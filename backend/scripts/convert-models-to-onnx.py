@@ -6,14 +6,39 @@ This script converts:
 2. Acne type model
 
 Usage:
-    python scripts/convert-models-to-onnx.py
+    python scripts/convert-models-to-onnx.py [--quantize {none,dynamic,static}] [--prune AMOUNT] [--fp16] [--jobs N]
+
+Each model is exported at opset 17 and an offline-optimized copy
+(<name>.opt.onnx) is written next to it, which the Node.js loader prefers.
+A <name>.session_options.json sidecar records the ORT session settings the
+loader should use for it.
+
+With --quantize, an INT8 variant (<name>.int8.onnx) is written next to each
+FP32 model. "static" calibrates activations on images from model/calib/ and
+falls back to "dynamic" (weights only) when no calibration images exist.
+
+With --prune, that fraction of the last conv stage's channels (lowest L2
+norm) is removed before export, along with the matching classifier inputs.
+
+With --fp16, a half-precision variant (<name>.fp16.onnx) is written for
+GPU execution providers; inputs/outputs stay float32.
+
+Requires torch, torchvision, numpy and onnx (plus onnxscript for the dynamo
+exporter). onnxruntime (.opt and .int8 variants), onnxconverter-common
+(--fp16), onnxsim and Pillow (static calibration) are optional: a variant
+whose package is missing is skipped and the base .onnx is still published.
 """
 
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import torch
 import torch.nn as nn
 from torchvision import models
 from pathlib import Path
 import sys
+import numpy as np
 
 # No need to import from backend - we create models directly using torchvision
 
@@ -22,32 +47,443 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 MODEL_DIR = PROJECT_ROOT / "model"
 OUTPUT_DIR = PROJECT_ROOT / "backend-node" / "model"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+CALIB_DIR = MODEL_DIR / "calib"
+
+# Preprocessing must match backend/src/services/ml/preprocess.ts
+IMAGE_SIZE = 224
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+# (pixel / 255 - mean) / std folded into pixel * SCALE + OFFSET, as in preprocess.ts
+NORM_SCALE = (1.0 / (255.0 * IMAGENET_STD)).astype(np.float32)
+NORM_OFFSET = (-IMAGENET_MEAN / IMAGENET_STD).astype(np.float32)
+MAX_CALIB_IMAGES = 100
+
+NUM_CLASSES_BY_TYPE = {"binary": 2, "severity": 4, "type": 6}
+
+OPSET_VERSION = 17
+MAX_BATCH_SIZE = 32  # Upper bound for the exported dynamic batch dimension
+WORKER_NUM_THREADS = 2  # torch intra-op threads per conversion process
 
 def create_efficientnet_b0(num_classes: int) -> nn.Module:
-    """Create EfficientNet-B0 architecture."""
-    model = models.efficientnet_b0(weights=models.EfficientNet_B0_Weights.IMAGENET1K_V1)
+    """Create EfficientNet-B0 architecture (weights are loaded from the checkpoint)."""
+    model = models.efficientnet_b0(weights=None)
     in_features = model.classifier[1].in_features
     model.classifier[1] = nn.Linear(in_features, num_classes)
     return model
 
 def create_resnet18(num_classes: int) -> nn.Module:
-    """Create ResNet18 architecture."""
-    model = models.resnet18(weights=models.ResNet18_Weights.IMAGENET1K_V1)
+    """Create ResNet18 architecture (weights are loaded from the checkpoint)."""
+    model = models.resnet18(weights=None)
     in_features = model.fc.in_features
     model.fc = nn.Linear(in_features, num_classes)
     return model
 
 def create_mobilenet_v2(num_classes: int) -> nn.Module:
-    """Create MobileNetV2 architecture."""
-    model = models.mobilenet_v2(weights=models.MobileNet_V2_Weights.IMAGENET1K_V1)
+    """Create MobileNetV2 architecture (weights are loaded from the checkpoint)."""
+    model = models.mobilenet_v2(weights=None)
     in_features = model.classifier[1].in_features
     model.classifier[1] = nn.Linear(in_features, num_classes)
     return model
 
+def preprocess_calibration_image(image_path: Path) -> np.ndarray:
+    """Load an image as a (1, 3, 224, 224) float32 array normalized like inference."""
+    from PIL import Image  # only static quantization needs it
+
+    img = Image.open(image_path).convert("RGB").resize((IMAGE_SIZE, IMAGE_SIZE), Image.BILINEAR)
+    arr = np.asarray(img, dtype=np.float32)  # fresh writable copy of the pixels
+    arr *= NORM_SCALE
+    arr += NORM_OFFSET
+    return np.ascontiguousarray(arr.transpose(2, 0, 1))[np.newaxis, ...]
+
+def find_calibration_images() -> list:
+    """Return up to MAX_CALIB_IMAGES image paths from CALIB_DIR."""
+    if not CALIB_DIR.is_dir():
+        return []
+    # scandir answers is_file() from the cached dirent; no Path object or stat per entry
+    with os.scandir(CALIB_DIR) as entries:
+        names = sorted(
+            e.name for e in entries
+            if e.name.lower().endswith((".jpg", ".jpeg", ".png")) and e.is_file()
+        )
+    return [CALIB_DIR / name for name in names[:MAX_CALIB_IMAGES]]
+
+def _slice_conv2d(conv: nn.Conv2d, out_idx=None, in_idx=None) -> nn.Conv2d:
+    """Copy a (groups=1) Conv2d keeping only the given output/input channels."""
+    weight = conv.weight.detach()
+    if out_idx is not None:
+        weight = weight[out_idx]
+    if in_idx is not None:
+        weight = weight[:, in_idx]
+    new_conv = nn.Conv2d(
+        weight.shape[1], weight.shape[0], conv.kernel_size,
+        stride=conv.stride, padding=conv.padding, dilation=conv.dilation,
+        bias=conv.bias is not None,
+    )
+    new_conv.weight.data.copy_(weight)
+    if conv.bias is not None:
+        bias = conv.bias.detach()
+        new_conv.bias.data.copy_(bias[out_idx] if out_idx is not None else bias)
+    return new_conv
+
+def _slice_batchnorm2d(bn: nn.BatchNorm2d, idx) -> nn.BatchNorm2d:
+    """Copy a BatchNorm2d keeping only the given channels."""
+    new_bn = nn.BatchNorm2d(len(idx), eps=bn.eps, momentum=bn.momentum)
+    new_bn.weight.data.copy_(bn.weight.detach()[idx])
+    new_bn.bias.data.copy_(bn.bias.detach()[idx])
+    new_bn.running_mean.copy_(bn.running_mean[idx])
+    new_bn.running_var.copy_(bn.running_var[idx])
+    return new_bn
+
+def _slice_linear_inputs(linear: nn.Linear, idx) -> nn.Linear:
+    """Copy a Linear layer keeping only the given input features."""
+    new_linear = nn.Linear(len(idx), linear.out_features, bias=linear.bias is not None)
+    new_linear.weight.data.copy_(linear.weight.detach()[:, idx])
+    if linear.bias is not None:
+        new_linear.bias.data.copy_(linear.bias.detach())
+    return new_linear
+
+def _top_l2_channels(conv: nn.Conv2d, amount: float) -> torch.Tensor:
+    """Indices of the output channels with the largest L2 norm, after dropping `amount`."""
+    norms = conv.weight.detach().flatten(1).norm(p=2, dim=1)
+    keep = max(1, int(round(conv.out_channels * (1.0 - amount))))
+    return norms.topk(keep).indices.sort().values
+
+def prune_head_channels(model: nn.Module, amount: float) -> nn.Module:
+    """
+    Structurally prune the last conv stage feeding the classifier.
+    
+    Channels are physically removed (not just zeroed) so the exported graph
+    is smaller: EfficientNet/MobileNetV2 lose output channels of the final
+    1x1 conv and the matching classifier inputs; ResNet18 loses inner
+    channels of its last BasicBlock (the block output feeds the residual add).
+    """
+    if isinstance(model, models.ResNet):
+        block = model.layer4[-1]
+        idx = _top_l2_channels(block.conv1, amount)
+        block.conv1 = _slice_conv2d(block.conv1, out_idx=idx)
+        block.bn1 = _slice_batchnorm2d(block.bn1, idx)
+        block.conv2 = _slice_conv2d(block.conv2, in_idx=idx)
+    elif isinstance(model, (models.EfficientNet, models.MobileNetV2)):
+        head = model.features[-1]
+        idx = _top_l2_channels(head[0], amount)
+        head[0] = _slice_conv2d(head[0], out_idx=idx)
+        head[1] = _slice_batchnorm2d(head[1], idx)
+        model.classifier[1] = _slice_linear_inputs(model.classifier[1], idx)
+    else:
+        print(f"⚠️  Pruning not supported for {type(model).__name__}, skipping")
+        return model
+
+    print(f"✂️  Pruned {amount:.0%} of head channels ({len(idx)} kept)")
+    return model
+
+def fuse_conv_bn(model: nn.Module) -> nn.Module:
+    """
+    Fold BatchNorm into the preceding Conv (and a following ReLU where safe).
+    
+    The model must be in eval mode. ReLU6/SiLU activations (MobileNetV2,
+    EfficientNet) aren't fusable, so those blocks only get Conv+BN folded.
+    """
+    from torch.ao.quantization import fuse_modules
+
+    if isinstance(model, models.ResNet):
+        fuse_modules(model, [['conv1', 'bn1', 'relu']], inplace=True)
+        for layer in (model.layer1, model.layer2, model.layer3, model.layer4):
+            for block in layer:
+                # BasicBlock reuses self.relu after the residual add, so it
+                # can't be folded into conv1
+                fuse_modules(block, [['conv1', 'bn1'], ['conv2', 'bn2']], inplace=True)
+                if block.downsample is not None:
+                    fuse_modules(block.downsample, [['0', '1']], inplace=True)
+        return model
+
+    for module in model.modules():
+        if not isinstance(module, nn.Sequential):
+            continue
+        children = list(module.named_children())
+        groups = []
+        for i in range(len(children) - 1):
+            (conv_name, conv), (bn_name, bn) = children[i], children[i + 1]
+            if isinstance(conv, nn.Conv2d) and isinstance(bn, nn.BatchNorm2d):
+                group = [conv_name, bn_name]
+                if i + 2 < len(children) and type(children[i + 2][1]) is nn.ReLU:
+                    group.append(children[i + 2][0])
+                groups.append(group)
+        if groups:
+            fuse_modules(module, groups, inplace=True)
+    return model
+
+def has_dynamic_batch(onnx_path: Path) -> bool:
+    """Check that the exported model's input batch dimension is symbolic."""
+    import onnx
+
+    model = onnx.load(str(onnx_path), load_external_data=False)
+    batch_dim = model.graph.input[0].type.tensor_type.shape.dim[0]
+    return bool(batch_dim.dim_param)
+
+def export_onnx(model: nn.Module, output_path: Path):
+    """
+    Export a model to ONNX with a dynamic batch dimension.
+    
+    Uses the dynamo exporter with an explicit batch Dim so batch size isn't
+    baked into Reshape/Gather nodes, falling back to the legacy TorchScript
+    exporter with dynamic_axes if that fails.
+    """
+    # Example batch of 2: torch.export specializes dimensions of size 1
+    dummy_input = torch.randn(2, 3, IMAGE_SIZE, IMAGE_SIZE)
+
+    try:
+        from torch.export import Dim
+
+        batch = Dim("batch", min=1, max=MAX_BATCH_SIZE)
+        program = torch.onnx.export(
+            model,
+            (dummy_input,),
+            dynamo=True,
+            input_names=['input'],
+            output_names=['output'],
+            dynamic_shapes=({0: batch},),
+            opset_version=OPSET_VERSION,
+        )
+        program.optimize()
+        program.save(str(output_path))
+
+        if not has_dynamic_batch(output_path):
+            raise RuntimeError("batch dimension was exported as a static size")
+        return
+    except Exception as e:
+        print(f"⚠️  Dynamo export failed ({e}), falling back to legacy exporter")
+
+    torch.onnx.export(
+        model,
+        dummy_input,
+        str(output_path),
+        export_params=True,
+        opset_version=OPSET_VERSION,
+        do_constant_folding=True,
+        input_names=['input'],
+        output_names=['output'],
+        dynamic_axes={
+            'input': {0: 'batch_size'},
+            'output': {0: 'batch_size'}
+        }
+    )
+
+# Session settings for these single-stream CNNs; intra-op threads are left to
+# the loader since they depend on the serving machine, not this one
+SESSION_OPTIONS = {
+    "execution_mode": "sequential",
+    "inter_op_num_threads": 1,
+    "enable_cpu_mem_arena": True,
+    "enable_mem_pattern": True,
+    "graph_optimization_level": "all",
+}
+
+def write_session_options(onnx_path: Path):
+    """Write the <name>.session_options.json sidecar read by the Node.js loader."""
+    sidecar_path = onnx_path.with_suffix(".session_options.json")
+    sidecar_path.write_text(json.dumps(SESSION_OPTIONS, indent=2) + "\n")
+    print(f"✅ Session options saved to {sidecar_path}")
+
+def publish_onnx(tmp_path: Path, output_path: Path):
+    """
+    Validate an exported model and atomically move it into place.
+    
+    The temp file lives next to the output (not in /tmp) so os.replace stays
+    a same-filesystem rename; a killed export never leaves a truncated
+    model at the path the server loads.
+    """
+    import onnx
+
+    onnx.checker.check_model(str(tmp_path))
+
+    try:
+        from onnxsim import simplify
+    except ImportError:
+        simplify = None
+
+    if simplify is not None:
+        simplified, ok = simplify(onnx.load(str(tmp_path)))
+        if ok:
+            onnx.save(simplified, str(tmp_path))
+        else:
+            print(f"⚠️  onnxsim could not validate the simplified model, keeping original graph")
+
+    os.replace(tmp_path, output_path)
+
+def variant_paths(onnx_path: Path) -> list:
+    """Paths of the derived models the Node.js loader may prefer over <name>.onnx."""
+    return [
+        onnx_path.with_name(onnx_path.stem + ".opt.onnx"),
+        onnx_path.with_suffix(".int8.onnx"),
+        onnx_path.with_suffix(".fp16.onnx"),
+    ]
+
+def remove_stale_variants(onnx_path: Path):
+    """
+    Delete variants derived from a previous export of this model.
+    
+    The loader prefers them over the base model, so one left over from an
+    older export (or one not regenerated this run) would shadow the new weights.
+    """
+    for path in variant_paths(onnx_path):
+        if path.exists():
+            path.unlink()
+            print(f"🗑️  Removed stale {path.name}")
+
+def publish_variant(variant_path: Path, write) -> bool:
+    """
+    Write a derived model through a temp file and os.replace it into place.
+    
+    write(tmp_path) produces the model. On any failure (including a missing
+    optional package) the variant is left absent rather than stale or
+    truncated, so the loader falls back to the base model.
+    """
+    tmp_path = variant_path.with_name(variant_path.name + ".tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, variant_path)
+        return True
+    except Exception as e:
+        print(f"❌ Error writing {variant_path.name}: {e}")
+        variant_path.unlink(missing_ok=True)
+        return False
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+def optimize_onnx_model(onnx_path: Path) -> bool:
+    """
+    Write a graph-optimized copy (<name>.opt.onnx) of an exported ONNX model.
+    
+    Uses ORT_ENABLE_EXTENDED rather than ORT_ENABLE_ALL: the latter adds
+    hardware-specific layout transforms, and the saved model must also run
+    on the deployment machine.
+    """
+    optimized_path = onnx_path.with_name(onnx_path.stem + ".opt.onnx")
+
+    def write(tmp_path: Path):
+        import onnxruntime as ort
+
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        so.optimized_model_filepath = str(tmp_path)
+        ort.InferenceSession(str(onnx_path), sess_options=so, providers=["CPUExecutionProvider"])
+
+    if not publish_variant(optimized_path, write):
+        return False
+    print(f"✅ Optimized model saved to {optimized_path}")
+    return True
+
+def convert_onnx_to_fp16(onnx_path: Path) -> bool:
+    """Write an FP16 variant (<name>.fp16.onnx) keeping float32 inputs/outputs."""
+    fp16_path = onnx_path.with_suffix(".fp16.onnx")
+
+    def write(tmp_path: Path):
+        import onnx
+        from onnxconverter_common import float16
+
+        model = onnx.load(str(onnx_path))
+        model_fp16 = float16.convert_float_to_float16(model, keep_io_types=True)
+        onnx.save(model_fp16, str(tmp_path))
+
+    if not publish_variant(fp16_path, write):
+        return False
+    print(f"✅ FP16 model saved to {fp16_path}")
+    return True
+
+def quantize_onnx_model(onnx_path: Path, mode: str) -> bool:
+    """
+    Write an INT8 variant (<name>.int8.onnx) of an exported FP32 ONNX model.
+    
+    Args:
+        onnx_path: Path to the FP32 .onnx file
+        mode: "static" (QDQ, calibrated activations) or "dynamic" (weights only)
+    """
+    quantized_path = onnx_path.with_suffix(".int8.onnx")
+
+    if mode == "static":
+        calib_images = find_calibration_images()
+        if not calib_images:
+            print(f"⚠️  No calibration images in {CALIB_DIR}, falling back to dynamic quantization")
+            mode = "dynamic"
+
+    def write(tmp_path: Path):
+        from onnxruntime.quantization import (
+            CalibrationDataReader,
+            QuantFormat,
+            QuantType,
+            quantize_dynamic,
+            quantize_static,
+        )
+
+        class ImageCalibrationDataReader(CalibrationDataReader):
+            def __init__(self, image_paths: list, input_name: str):
+                self.input_name = input_name
+                self.images = iter(image_paths)
+
+            def get_next(self):
+                image_path = next(self.images, None)
+                if image_path is None:
+                    return None
+                return {self.input_name: preprocess_calibration_image(image_path)}
+
+        if mode == "static":
+            print(f"🔢 Static INT8 quantization with {len(calib_images)} calibration images...")
+            quantize_static(
+                str(onnx_path),
+                str(tmp_path),
+                calibration_data_reader=ImageCalibrationDataReader(calib_images, "input"),
+                quant_format=QuantFormat.QDQ,
+                per_channel=True,
+                weight_type=QuantType.QInt8,
+                activation_type=QuantType.QUInt8,
+            )
+        else:
+            print(f"🔢 Dynamic INT8 quantization (weights only)...")
+            quantize_dynamic(
+                str(onnx_path),
+                str(tmp_path),
+                weight_type=QuantType.QInt8,
+            )
+
+    if not publish_variant(quantized_path, write):
+        return False
+    print(f"✅ Quantized model saved to {quantized_path}")
+    return True
+
+def create_model(arch: str, num_classes: int) -> nn.Module:
+    """Create the architecture named in a checkpoint."""
+    if arch in ["efficientnet_b0", "efficientnet"]:
+        return create_efficientnet_b0(num_classes)
+    elif arch == "resnet18":
+        return create_resnet18(num_classes)
+    elif arch in ["mobilenet_v2", "mobilenet"]:
+        return create_mobilenet_v2(num_classes)
+    print(f"⚠️  Unknown architecture: {arch}, using EfficientNet-B0")
+    return create_efficientnet_b0(num_classes)
+
+def load_checkpoint_weights(model: nn.Module, state_dict: dict) -> set:
+    """Load checkpoint weights into model, returning the set of keys that were loaded."""
+    model_dict = model.state_dict()
+    # Try to load with strict=False to handle minor mismatches
+    try:
+        model.load_state_dict(state_dict, strict=False)
+        return set(state_dict) & set(model_dict)
+    except RuntimeError as e:
+        print(f"⚠️  Warning: Some weights couldn't be loaded: {e}")
+        # Try loading only matching keys
+        pretrained_dict = {k: v for k, v in state_dict.items() if k in model_dict and model_dict[k].shape == v.shape}
+        model_dict.update(pretrained_dict)
+        model.load_state_dict(model_dict)
+        print(f"✅ Loaded {len(pretrained_dict)}/{len(state_dict)} parameters")
+        return set(pretrained_dict)
+
 def convert_model_to_onnx(
     checkpoint_path: Path,
     output_path: Path,
-    model_type: str = "severity"  # "severity", "binary", or "type"
+    model_type: str = "severity",  # "severity", "binary", or "type"
+    quantize: str = "none",  # "none", "dynamic", or "static"
+    prune_amount: float = 0.0,
+    fp16: bool = False
 ):
     """
     Convert a PyTorch model checkpoint to ONNX format.
@@ -56,6 +492,9 @@ def convert_model_to_onnx(
         checkpoint_path: Path to .pth checkpoint file
         output_path: Path to save .onnx file
         model_type: Type of model (determines num_classes)
+        quantize: INT8 quantization mode for an additional .int8.onnx variant
+        prune_amount: Fraction of head channels to remove before export (0 disables)
+        fp16: Also write a half-precision .fp16.onnx variant
     """
     if not checkpoint_path.exists():
         print(f"⚠️  Checkpoint not found: {checkpoint_path}")
@@ -92,33 +531,13 @@ def convert_model_to_onnx(
             arch = arch.lower().replace("-", "_").replace(" ", "_")
         
         # Get num_classes from checkpoint or infer from model_type
-        if checkpoint.get("num_classes"):
-            num_classes = checkpoint.get("num_classes")
-        elif model_type == "binary":
-            num_classes = 2
-        elif model_type == "severity":
-            num_classes = 4
-        elif model_type == "type":
-            num_classes = 6
-        else:
-            num_classes = 4
+        num_classes = checkpoint.get("num_classes") or NUM_CLASSES_BY_TYPE.get(model_type, 4)
         
         # Validate num_classes matches class_names length for type model
         if model_type == "type" and checkpoint.get("class_names"):
             if len(checkpoint.get("class_names")) != num_classes:
                 print(f"⚠️  WARNING: num_classes ({num_classes}) doesn't match class_names length ({len(checkpoint.get('class_names'))})")
         
-        # Create model architecture
-        if arch in ["efficientnet_b0", "efficientnet"]:
-            model = create_efficientnet_b0(num_classes)
-        elif arch == "resnet18":
-            model = create_resnet18(num_classes)
-        elif arch in ["mobilenet_v2", "mobilenet"]:
-            model = create_mobilenet_v2(num_classes)
-        else:
-            print(f"⚠️  Unknown architecture: {arch}, using EfficientNet-B0")
-            model = create_efficientnet_b0(num_classes)
-        
         # Load weights
         state_dict = None
         if "model_state_dict" in checkpoint:
@@ -129,41 +548,46 @@ def convert_model_to_onnx(
             print(f"❌ No state_dict found in checkpoint")
             return False
         
-        # Try to load with strict=False to handle minor mismatches
-        try:
-            model.load_state_dict(state_dict, strict=False)
-        except RuntimeError as e:
-            print(f"⚠️  Warning: Some weights couldn't be loaded: {e}")
-            # Try loading only matching keys
-            model_dict = model.state_dict()
-            pretrained_dict = {k: v for k, v in state_dict.items() if k in model_dict and model_dict[k].shape == v.shape}
-            model_dict.update(pretrained_dict)
-            model.load_state_dict(model_dict)
-            print(f"✅ Loaded {len(pretrained_dict)}/{len(state_dict)} parameters")
+        # Build the architecture on the meta device and only allocate storage
+        # on CPU; every tensor is about to be overwritten by the checkpoint
+        with torch.device("meta"):
+            model = create_model(arch, num_classes)
+        model = model.to_empty(device="cpu")
+        loaded_keys = load_checkpoint_weights(model, state_dict)
         
-        model.eval()
+        missing_keys = set(model.state_dict()) - loaded_keys
+        if missing_keys:
+            # to_empty() leaves uninitialized memory, so rebuild with real
+            # initialization for any parameters the checkpoint doesn't cover
+            print(f"⚠️  {len(missing_keys)} parameters missing from checkpoint, using default initialization")
+            model = create_model(arch, num_classes)
+            load_checkpoint_weights(model, state_dict)
         
-        # Create dummy input (1, 3, 224, 224) - RGB image
-        dummy_input = torch.randn(1, 3, 224, 224)
+        if prune_amount > 0:
+            prune_head_channels(model, prune_amount)
         
-        # Export to ONNX
-        torch.onnx.export(
-            model,
-            dummy_input,
-            str(output_path),
-            export_params=True,
-            opset_version=11,  # ONNX opset version
-            do_constant_folding=True,
-            input_names=['input'],
-            output_names=['output'],
-            dynamic_axes={
-                'input': {0: 'batch_size'},
-                'output': {0: 'batch_size'}
-            }
-        )
+        model.eval()
+        fuse_conv_bn(model)
+        
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        try:
+            export_onnx(model, tmp_path)
+            publish_onnx(tmp_path, output_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
         
         print(f"✅ Successfully converted to {output_path}")
         
+        remove_stale_variants(output_path)
+        optimize_onnx_model(output_path)
+        write_session_options(output_path)
+        
+        if quantize != "none":
+            quantize_onnx_model(output_path, quantize)
+        
+        if fp16:
+            convert_onnx_to_fp16(output_path)
+        
         # Log class order for type model
         if model_type == "type" and checkpoint.get("class_names"):
             print(f"📋 Class order preserved in ONNX model:")
@@ -178,16 +602,53 @@ def convert_model_to_onnx(
         traceback.print_exc()
         return False
 
+def init_worker():
+    """Limit intra-op threads per worker process to avoid oversubscribing cores."""
+    torch.set_num_threads(WORKER_NUM_THREADS)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert PyTorch models to ONNX format")
+    parser.add_argument(
+        "--quantize",
+        choices=["none", "dynamic", "static"],
+        default="none",
+        help="Also write an INT8 <name>.int8.onnx variant (static uses model/calib/ images)",
+    )
+    parser.add_argument(
+        "--prune",
+        type=float,
+        default=0.0,
+        metavar="AMOUNT",
+        help="Fraction (0-1) of last-stage conv channels to remove before export",
+    )
+    parser.add_argument(
+        "--fp16",
+        action="store_true",
+        help="Also write an FP16 <name>.fp16.onnx variant for GPU execution providers",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // WORKER_NUM_THREADS),
+        help="Number of checkpoints to convert in parallel",
+    )
+    args = parser.parse_args()
+    if not 0.0 <= args.prune < 1.0:
+        parser.error("--prune must be in [0, 1)")
+    return args
+
 def main():
     """Convert all models to ONNX format."""
+    args = parse_args()
+    
     print("🚀 Starting model conversion to ONNX...")
     print(f"📁 Model directory: {MODEL_DIR}")
     print(f"📁 Output directory: {OUTPUT_DIR}")
     
-    converted = 0
-    failed = 0
+    # Collect (checkpoint, output, model_type) jobs
+    jobs = []
     
-    # Convert severity models
+    # Severity models
     severity_patterns = [
         ("acne_severity_*_best.pth", "severity"),
         ("acne_mobilenet_v2_best.pth", "severity"),  # Check if this is severity
@@ -195,33 +656,38 @@ def main():
     
     for pattern, model_type in severity_patterns:
         for model_file in MODEL_DIR.glob(pattern):
-            output_name = model_file.stem + ".onnx"
-            output_path = OUTPUT_DIR / output_name
-            if convert_model_to_onnx(model_file, output_path, model_type):
-                converted += 1
-            else:
-                failed += 1
+            jobs.append((model_file, OUTPUT_DIR / (model_file.stem + ".onnx"), model_type))
     
-    # Convert binary models
+    # Binary models
     for model_file in MODEL_DIR.glob("acne_binary_*_best.pth"):
-        output_name = model_file.stem + ".onnx"
-        output_path = OUTPUT_DIR / output_name
-        if convert_model_to_onnx(model_file, output_path, "binary"):
-            converted += 1
-        else:
-            failed += 1
+        jobs.append((model_file, OUTPUT_DIR / (model_file.stem + ".onnx"), "binary"))
     
-    # Convert type model
+    # Type model
     type_model = MODEL_DIR / "acne_type_best.pth"
     if type_model.exists():
-        output_path = OUTPUT_DIR / "acne_type_best.onnx"
-        if convert_model_to_onnx(type_model, output_path, "type"):
-            converted += 1
-        else:
-            failed += 1
+        jobs.append((type_model, OUTPUT_DIR / "acne_type_best.onnx", "type"))
     else:
         print(f"⚠️  Type model not found: {type_model}")
     
+    converted = 0
+    failed = 0
+    
+    # Each export is a CPU-bound trace, so convert checkpoints in separate processes
+    max_workers = max(1, min(args.jobs, len(jobs)))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker) as executor:
+        futures = [
+            executor.submit(
+                convert_model_to_onnx, checkpoint, output_path, model_type,
+                args.quantize, args.prune, args.fp16,
+            )
+            for checkpoint, output_path, model_type in jobs
+        ]
+        for future in as_completed(futures):
+            if future.result():
+                converted += 1
+            else:
+                failed += 1
+    
     print(f"\n📊 Conversion Summary:")
     print(f"   ✅ Converted: {converted}")
     print(f"   ❌ Failed: {failed}")
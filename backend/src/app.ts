@@ -7,6 +7,7 @@ import { corsMiddleware } from './middleware/cors';
 import { securityHeaders } from './middleware/securityHeaders';
 import { errorHandler, notFoundHandler } from './middleware/errorHandler';
 import { requestLogger } from './middleware/requestLogger';
+import { compressJson } from './middleware/compression';
 import { logger } from './utils/logger';
 import authRoutes from './routes/auth';
 import diagnosisRoutes from './routes/diagnosis';
@@ -18,12 +19,17 @@ import { existsSync, mkdirSync } from 'fs';
 
 const app: Express = express();
 
+// API responses are per-user and never revalidated by the clients, so skip
+// hashing every JSON body for an ETag (static uploads keep their own ETags)
+app.set('etag', false);
+
 // Middleware
 app.use(express.json({ limit: '10mb' }));
 app.use(express.urlencoded({ extended: true, limit: '10mb' }));
 app.use(corsMiddleware);
 app.use(securityHeaders);
 app.use(requestLogger);
+app.use(compressJson);
 
 // Ensure uploads and logs directories exist
 const uploadsDir = join(process.cwd(), 'uploads');
@@ -68,12 +74,16 @@ app.use(errorHandler);
 // Startup function
 async function startServer(): Promise<void> {
   try {
-    // Initialize database
+    if (config.isProduction && !config.passwordPepper) {
+      // An empty HMAC key leaves the prehash unkeyed; refuse rather than hash with it
+      throw new Error('PASSWORD_PEPPER must be set in production');
+    }
+
+    // ML models load in the background; classify() waits for them, so
+    // non-diagnosis endpoints are served as soon as the database is up
+    void initializeModels();
     await initializeDatabase();
 
-    // Initialize ML models
-    await initializeModels();
-
     // Start server
     app.listen(config.port, config.host, () => {
       logger.info('🚀 Server started', {
@@ -82,6 +92,9 @@ async function startServer(): Promise<void> {
         port: config.port,
         apiPrefix: config.apiV1Prefix,
       });
+
+      // PM2 (wait_ready in ecosystem.config.js) holds each cluster instance until it hears this
+      process.send?.('ready');
     });
   } catch (error) {
     logger.error('❌ Failed to start server', { error });
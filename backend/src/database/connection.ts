@@ -1,4 +1,5 @@
 import { DataSource } from 'typeorm';
+import { join } from 'path';
 import { config } from '../config';
 import { User } from '../models/User';
 import { Diagnosis } from '../models/Diagnosis';
@@ -8,10 +9,17 @@ import { Reminder } from '../models/Reminder';
 export const AppDataSource = new DataSource({
   type: 'postgres',
   url: config.databaseUrl,
+  // Per process: PM2 cluster mode multiplies this by the number of instances
+  poolSize: config.dbPoolSize,
+  extra: {
+    connectionTimeoutMillis: 10000, // Fail instead of queueing forever on a saturated pool
+    maxLifetimeSeconds: 1800, // Recycle connections (e.g. after a PgBouncer/failover switch)
+  },
   entities: [User, Diagnosis, Prescription, Reminder],
   synchronize: config.isDevelopment, // Only in development
   logging: false, // Disable verbose SQL query logging
-  migrations: ['src/database/migrations/*.ts'],
+  // Resolved relative to this file so the compiled dist/ build finds them too
+  migrations: [join(__dirname, 'migrations', '*.{ts,js}')],
 });
 
 export async function initializeDatabase(): Promise<void> {
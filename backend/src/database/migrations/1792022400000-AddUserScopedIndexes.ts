@@ -0,0 +1,65 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+/**
+ * Composite indexes for the per-user queries
+ * (user_id, created_at) serves the newest-first list endpoints; Postgres walks
+ * it backwards for ORDER BY created_at DESC, so no sort node is needed.
+ * Lookups by id already go through the primary key, so no (user_id, id) index.
+ */
+export class AddUserScopedIndexes1792022400000 implements MigrationInterface {
+  name = 'AddUserScopedIndexes1792022400000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    // Fresh databases get their tables (and these indexes) from the entities
+    if (!(await queryRunner.hasTable('prescriptions'))) {
+      return;
+    }
+
+    await queryRunner.query(
+      `CREATE INDEX IF NOT EXISTS "ix_diagnoses_user_created" ON "diagnoses" ("user_id", "created_at")`
+    );
+    await queryRunner.query(
+      `CREATE INDEX IF NOT EXISTS "ix_prescriptions_user_created" ON "prescriptions" ("user_id", "created_at")`
+    );
+    await queryRunner.query(
+      `CREATE INDEX IF NOT EXISTS "ix_reminders_user_created" ON "reminders" ("user_id", "created_at")`
+    );
+
+    // The old check-then-insert in createPrescription could race and store the same
+    // (diagnosis_id, user_id) twice, which would make the unique index below fail.
+    // Keep one row per group, preferring a doctor's decision (approved, then rejected)
+    // over a pending draft so approved_at/doctor_notes survive, and the newest among
+    // equals. Reminders move off the others first (reminders.prescription_id
+    // references them). NULL diagnosis_ids never conflict.
+    const duplicates = `
+      SELECT id, first_value(id) OVER w AS keep_id, row_number() OVER w AS rn
+      FROM "prescriptions"
+      WHERE diagnosis_id IS NOT NULL
+      WINDOW w AS (
+        PARTITION BY diagnosis_id, user_id
+        ORDER BY CASE status WHEN 'approved' THEN 0 WHEN 'rejected' THEN 1 ELSE 2 END,
+                 created_at DESC, id DESC
+      )
+    `;
+    await queryRunner.query(
+      `UPDATE "reminders" r SET prescription_id = d.keep_id
+       FROM (${duplicates}) d
+       WHERE r.prescription_id = d.id AND d.rn > 1`
+    );
+    await queryRunner.query(
+      `DELETE FROM "prescriptions" p
+       USING (${duplicates}) d
+       WHERE p.id = d.id AND d.rn > 1`
+    );
+    await queryRunner.query(
+      `CREATE UNIQUE INDEX IF NOT EXISTS "uq_prescriptions_diagnosis_user" ON "prescriptions" ("diagnosis_id", "user_id")`
+    );
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`DROP INDEX IF EXISTS "uq_prescriptions_diagnosis_user"`);
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_reminders_user_created"`);
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_prescriptions_user_created"`);
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_diagnoses_user_created"`);
+  }
+}
@@ -0,0 +1,25 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+/**
+ * Partial index for the doctor approval queue
+ * The queue reads every user's pending prescriptions newest-first; indexing only
+ * the pending rows keeps the index small as approved/rejected ones accumulate.
+ */
+export class AddPendingPrescriptionsIndex1792108800000 implements MigrationInterface {
+  name = 'AddPendingPrescriptionsIndex1792108800000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    // Fresh databases get their tables (and this index) from the entities
+    if (!(await queryRunner.hasTable('prescriptions'))) {
+      return;
+    }
+
+    await queryRunner.query(
+      `CREATE INDEX IF NOT EXISTS "ix_prescriptions_pending_created" ON "prescriptions" ("created_at") WHERE status = 'pending'`
+    );
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_prescriptions_pending_created"`);
+  }
+}
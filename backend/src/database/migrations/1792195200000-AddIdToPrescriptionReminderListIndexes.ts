@@ -0,0 +1,38 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+/**
+ * Extend the per-user list indexes with id
+ * The list endpoints page by (created_at, id) so rows sharing a created_at
+ * (reminders from one auto-schedule INSERT) are neither skipped nor repeated;
+ * with id in the index the cursor comparison and ORDER BY come straight from it.
+ */
+export class AddIdToPrescriptionReminderListIndexes1792195200000 implements MigrationInterface {
+  name = 'AddIdToPrescriptionReminderListIndexes1792195200000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    // Fresh databases get their tables (and these indexes) from the entities
+    if (!(await queryRunner.hasTable('prescriptions'))) {
+      return;
+    }
+
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_prescriptions_user_created"`);
+    await queryRunner.query(
+      `CREATE INDEX "ix_prescriptions_user_created" ON "prescriptions" ("user_id", "created_at", "id")`
+    );
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_reminders_user_created"`);
+    await queryRunner.query(
+      `CREATE INDEX "ix_reminders_user_created" ON "reminders" ("user_id", "created_at", "id")`
+    );
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_reminders_user_created"`);
+    await queryRunner.query(
+      `CREATE INDEX "ix_reminders_user_created" ON "reminders" ("user_id", "created_at")`
+    );
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_prescriptions_user_created"`);
+    await queryRunner.query(
+      `CREATE INDEX "ix_prescriptions_user_created" ON "prescriptions" ("user_id", "created_at")`
+    );
+  }
+}
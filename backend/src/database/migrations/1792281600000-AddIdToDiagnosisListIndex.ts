@@ -0,0 +1,29 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+/**
+ * Extend the per-user diagnosis list index with id
+ * GET /diagnosis pages by (created_at, id); with id in the index the cursor
+ * comparison and ORDER BY come straight from it.
+ */
+export class AddIdToDiagnosisListIndex1792281600000 implements MigrationInterface {
+  name = 'AddIdToDiagnosisListIndex1792281600000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    // Fresh databases get their tables (and this index) from the entities
+    if (!(await queryRunner.hasTable('diagnoses'))) {
+      return;
+    }
+
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_diagnoses_user_created"`);
+    await queryRunner.query(
+      `CREATE INDEX "ix_diagnoses_user_created" ON "diagnoses" ("user_id", "created_at", "id")`
+    );
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_diagnoses_user_created"`);
+    await queryRunner.query(
+      `CREATE INDEX "ix_diagnoses_user_created" ON "diagnoses" ("user_id", "created_at")`
+    );
+  }
+}
@@ -0,0 +1,25 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+/**
+ * Index for the doctor's full prescription stream
+ * GET /doctor/prescriptions walks every prescription in (created_at, id) DESC
+ * pages; without this each page sorted the whole table.
+ */
+export class AddPrescriptionsStreamIndex1792368000000 implements MigrationInterface {
+  name = 'AddPrescriptionsStreamIndex1792368000000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    // Fresh databases get their tables (and this index) from the entities
+    if (!(await queryRunner.hasTable('prescriptions'))) {
+      return;
+    }
+
+    await queryRunner.query(
+      `CREATE INDEX IF NOT EXISTS "ix_prescriptions_created_id" ON "prescriptions" ("created_at", "id")`
+    );
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`DROP INDEX IF EXISTS "ix_prescriptions_created_id"`);
+  }
+}
@@ -1,13 +1,12 @@
 import { Request, Response, NextFunction } from 'express';
 import { verifyToken, extractTokenFromHeader } from '../utils/jwt';
-import { getUserById } from '../services/userService';
-import { User } from '../models/User';
+import { getUserById, PublicUser } from '../services/userService';
 
 // Extend Express Request to include user
 declare global {
   namespace Express {
     interface Request {
-      user?: User;
+      user?: PublicUser;
     }
   }
 }
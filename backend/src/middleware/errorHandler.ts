@@ -5,6 +5,32 @@ import { logger } from '../utils/logger';
 export interface AppError extends Error {
   statusCode?: number;
   status?: number;
+  code?: string;
+}
+
+// At most ERROR_LOG_BURST detailed error entries per ERROR_LOG_WINDOW_MS
+const ERROR_LOG_WINDOW_MS = 1000;
+const ERROR_LOG_BURST = 10;
+
+let errorWindowStart = 0;
+let errorsInWindow = 0;
+
+/**
+ * Error log sampling: reports how many entries were suppressed when a new window opens
+ */
+function shouldLogError(): boolean {
+  const now = Date.now();
+  if (now - errorWindowStart >= ERROR_LOG_WINDOW_MS) {
+    const suppressed = errorsInWindow - ERROR_LOG_BURST;
+    if (suppressed > 0) {
+      logger.warn('Request errors suppressed', { count: suppressed, windowMs: ERROR_LOG_WINDOW_MS });
+    }
+    errorWindowStart = now;
+    errorsInWindow = 0;
+  }
+
+  errorsInWindow += 1;
+  return errorsInWindow <= ERROR_LOG_BURST;
 }
 
 /**
@@ -16,20 +42,24 @@ export function errorHandler(
   res: Response,
   next: NextFunction
 ): void {
-  const statusCode = err.statusCode || err.status || 500;
+  // Multer aborts oversized uploads mid-stream with LIMIT_FILE_SIZE
+  const statusCode = err.statusCode || err.status || (err.code === 'LIMIT_FILE_SIZE' ? 413 : 500);
   const message = config.isProduction && statusCode === 500
     ? 'Internal server error'
     : err.message;
 
-  // Log error with context
-  logger.error('Request error', {
-    message: err.message,
-    stack: err.stack,
-    path: req.path,
-    method: req.method,
-    statusCode,
-    ip: req.ip || req.socket.remoteAddress,
-  });
+  // Log error with context; under an error storm only the first few per
+  // window get a full entry (reading err.stack makes V8 format the trace)
+  if (shouldLogError()) {
+    logger.error('Request error', {
+      message: err.message,
+      stack: statusCode >= 500 ? err.stack : undefined,
+      path: req.path,
+      method: req.method,
+      statusCode,
+      ip: req.ip || req.socket.remoteAddress,
+    });
+  }
 
   res.status(statusCode).json({
     detail: message,
@@ -1,15 +1,17 @@
 import { Request, Response, NextFunction } from 'express';
+import { performance } from 'perf_hooks';
 import { logger } from '../utils/logger';
 
 /**
  * Request timing middleware with structured logging
  */
 export function requestLogger(req: Request, res: Response, next: NextFunction): void {
-  const startTime = Date.now();
+  // Monotonic clock: unaffected by wall-clock adjustments
+  const startTime = performance.now();
 
   // Log when response finishes
   res.on('finish', () => {
-    const processTime = ((Date.now() - startTime) / 1000).toFixed(3);
+    const processTime = ((performance.now() - startTime) / 1000).toFixed(3);
     const logData = {
       method: req.method,
       path: req.path,
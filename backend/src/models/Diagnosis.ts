@@ -6,11 +6,13 @@ import {
   ManyToOne,
   OneToMany,
   JoinColumn,
+  Index,
 } from 'typeorm';
 import { User } from './User';
 import { Prescription } from './Prescription';
 
 @Entity('diagnoses')
+@Index('ix_diagnoses_user_created', ['userId', 'createdAt', 'id'])
 export class Diagnosis {
   @PrimaryColumn({ length: 50 })
   id!: string;
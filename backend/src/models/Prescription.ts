@@ -6,12 +6,17 @@ import {
   ManyToOne,
   OneToMany,
   JoinColumn,
+  Index,
 } from 'typeorm';
 import { User } from './User';
 import { Diagnosis } from './Diagnosis';
 import { Reminder } from './Reminder';
 
 @Entity('prescriptions')
+@Index('ix_prescriptions_user_created', ['userId', 'createdAt', 'id'])
+@Index('uq_prescriptions_diagnosis_user', ['diagnosisId', 'userId'], { unique: true })
+@Index('ix_prescriptions_created_id', ['createdAt', 'id'])
+@Index('ix_prescriptions_pending_created', ['createdAt'], { where: `status = 'pending'` })
 export class Prescription {
   @PrimaryColumn({ length: 50 })
   id!: string;
@@ -5,11 +5,13 @@ import {
   CreateDateColumn,
   ManyToOne,
   JoinColumn,
+  Index,
 } from 'typeorm';
 import { User } from './User';
 import { Prescription } from './Prescription';
 
 @Entity('reminders')
+@Index('ix_reminders_user_created', ['userId', 'createdAt', 'id'])
 export class Reminder {
   @PrimaryColumn({ length: 50 })
   id!: string;
@@ -1,11 +1,29 @@
 import { Router, Request, Response } from 'express';
 import { body, validationResult } from 'express-validator';
-import { createUser, authenticateUser, updateUser } from '../services/userService';
+import { createUser, authenticateUser, updateUser, PublicUser } from '../services/userService';
 import { createAccessToken } from '../utils/jwt';
 import { authenticate } from '../middleware/auth';
 
 const router = Router();
 
+/**
+ * Public view of a user; every auth endpoint returns this same shape
+ */
+function toUserResponse(user: PublicUser) {
+  return {
+    id: user.id,
+    email: user.email,
+    full_name: user.fullName,
+    phone: user.phone,
+    date_of_birth: user.dateOfBirth,
+    gender: user.gender,
+    skin_type: user.skinType,
+    role: user.role,
+    preferences: user.preferences,
+    created_at: user.createdAt.toISOString(),
+  };
+}
+
 /**
  * POST /api/v1/auth/register
  * Register a new user
@@ -44,17 +62,7 @@ router.post(
       res.status(201).json({
         access_token: accessToken,
         token_type: 'bearer',
-        user: {
-          id: user.id,
-          email: user.email,
-          full_name: user.fullName,
-          phone: user.phone,
-          date_of_birth: user.dateOfBirth,
-          gender: user.gender,
-          skin_type: user.skinType,
-          preferences: user.preferences,
-          created_at: user.createdAt.toISOString(),
-        },
+        user: toUserResponse(user),
       });
     } catch (error: any) {
       if (error.message === 'Email already registered') {
@@ -115,18 +123,7 @@ router.post(
       res.json({
         access_token: accessToken,
         token_type: 'bearer',
-        user: {
-          id: user.id,
-          email: user.email,
-          full_name: user.fullName,
-          phone: user.phone,
-          date_of_birth: user.dateOfBirth,
-          gender: user.gender,
-          skin_type: user.skinType,
-          role: user.role,
-          preferences: user.preferences,
-          created_at: user.createdAt.toISOString(),
-        },
+        user: toUserResponse(user),
       });
     } catch (error) {
       console.error('Login error:', error);
@@ -141,18 +138,7 @@ router.post(
  */
 router.get('/me', authenticate, async (req: Request, res: Response) => {
   const user = req.user!;
-  res.json({
-    id: user.id,
-    email: user.email,
-    full_name: user.fullName,
-    phone: user.phone,
-    date_of_birth: user.dateOfBirth,
-    gender: user.gender,
-    skin_type: user.skinType,
-    role: user.role,
-    preferences: user.preferences,
-    created_at: user.createdAt.toISOString(),
-  });
+  res.json(toUserResponse(user));
 });
 
 /**
@@ -193,17 +179,7 @@ router.put(
         return res.status(404).json({ detail: 'User not found' });
       }
 
-      res.json({
-        id: updatedUser.id,
-        email: updatedUser.email,
-        full_name: updatedUser.fullName,
-        phone: updatedUser.phone,
-        date_of_birth: updatedUser.dateOfBirth,
-        gender: updatedUser.gender,
-        skin_type: updatedUser.skinType,
-        preferences: updatedUser.preferences,
-        created_at: updatedUser.createdAt.toISOString(),
-      });
+      res.json(toUserResponse(updatedUser));
     } catch (error) {
       console.error('Update user error:', error);
       res.status(500).json({ detail: 'Internal server error' });
@@ -1,8 +1,8 @@
 import { Router, Request, Response } from 'express';
-import { body, validationResult } from 'express-validator';
+import { body, query, validationResult } from 'express-validator';
 import { authenticate } from '../middleware/auth';
 import { upload, validateImageFile } from '../utils/fileUpload';
-import { classify } from '../services/ml/inference';
+import { classify, ClassificationResult } from '../services/ml/inference';
 import {
   createDiagnosis,
   getDiagnosisById,
@@ -10,12 +10,19 @@ import {
   generateClinicalNotes,
   getUrgency,
   detectLesions,
+  DiagnosisListRow,
 } from '../services/diagnosisService';
 import { join } from 'path';
 import { config } from '../config';
+import { TTLCache } from '../utils/ttlCache';
+import { decodeCursor, toPage } from '../utils/cursor';
 
 const router = Router();
 
+// Recent classifications keyed by user + image content hash, so re-uploads
+// of the same image (UI retries) skip inference
+const classificationCache = new TTLCache<string, ClassificationResult>(1024, 60 * 60 * 1000);
+
 /**
  * POST /api/v1/diagnosis/analyze
  * Analyze skin image for acne severity classification
@@ -45,10 +52,18 @@ router.post(
 
       console.log(`🔍 Starting diagnosis for user ${user.id}, file: ${file.filename}`);
 
-      // Run ML inference
-      let classification;
+      // Run ML inference (or reuse the result for an identical recent upload)
+      const cacheKey = file.contentHash ? `${user.id}:${file.contentHash}` : null;
+      let classification = cacheKey ? classificationCache.get(cacheKey) : undefined;
       try {
-        classification = await classify(file.path);
+        if (classification) {
+          console.log(`♻️  Reusing cached classification for identical image`);
+        } else {
+          classification = (await classify(file.path)) ?? undefined;
+          if (classification && cacheKey) {
+            classificationCache.set(cacheKey, classification);
+          }
+        }
         if (!classification) {
           console.error('❌ ML inference returned null - models may not be loaded');
           return res.status(500).json({ 
@@ -181,36 +196,69 @@ router.get('/:id', authenticate, async (req: Request, res: Response) => {
   }
 });
 
+/**
+ * List view of a diagnosis
+ */
+function toDiagnosisListView(d: DiagnosisListRow) {
+  return {
+    id: d.id,
+    severity: d.severity,
+    acne_type: d.acneType,
+    confidence: d.confidence / 100.0,
+    severity_scores: d.severityScores,
+    lesion_counts: d.lesionCounts,
+    affected_areas: d.affectedAreas,
+    clinical_notes: d.clinicalNotes,
+    recommended_urgency: d.recommendedUrgency,
+    image_url: d.imageUrl,
+    created_at: d.createdAt.toISOString(),
+    metadata: d.clinicalMetadata,
+  };
+}
+
 /**
  * GET /api/v1/diagnosis
- * List all diagnoses for current user
+ * List diagnoses for current user, newest first
+ * Without query params, returns every diagnosis as an array. With limit (default 50,
+ * max 100) and/or cursor, returns one page as { items, next_cursor }; pass
+ * next_cursor back as cursor until it is null.
  */
-router.get('/', authenticate, async (req: Request, res: Response) => {
-  try {
-    const user = req.user!;
-    const diagnoses = await listDiagnoses(user.id);
-
-    res.json(
-      diagnoses.map((d) => ({
-        id: d.id,
-        severity: d.severity,
-        acne_type: d.acneType,
-        confidence: d.confidence / 100.0,
-        severity_scores: d.severityScores,
-        lesion_counts: d.lesionCounts,
-        affected_areas: d.affectedAreas,
-        clinical_notes: d.clinicalNotes,
-        recommended_urgency: d.recommendedUrgency,
-        image_url: d.imageUrl,
-        created_at: d.createdAt.toISOString(),
-        metadata: d.clinicalMetadata,
-      }))
-    );
-  } catch (error) {
-    console.error('List diagnoses error:', error);
-    res.status(500).json({ detail: 'Internal server error' });
+router.get(
+  '/',
+  authenticate,
+  [
+    query('limit').optional().isInt({ min: 1, max: 100 }).toInt(),
+    query('cursor')
+      .optional()
+      .isString()
+      .custom((value: string) => decodeCursor(value) !== null)
+      .withMessage('Invalid cursor'),
+  ],
+  async (req: Request, res: Response) => {
+    try {
+      const errors = validationResult(req);
+      if (!errors.isEmpty()) {
+        return res.status(400).json({ detail: errors.array() });
+      }
+
+      const user = req.user!;
+
+      if (req.query.limit === undefined && req.query.cursor === undefined) {
+        const diagnoses = await listDiagnoses(user.id);
+        return res.json(diagnoses.map(toDiagnosisListView));
+      }
+
+      const limit = (req.query.limit as unknown as number | undefined) ?? 50;
+      const cursor = req.query.cursor ? decodeCursor(req.query.cursor as string)! : undefined;
+      const { items, nextCursor } = toPage(await listDiagnoses(user.id, limit, cursor), limit);
+
+      res.json({ items: items.map(toDiagnosisListView), next_cursor: nextCursor });
+    } catch (error) {
+      console.error('List diagnoses error:', error);
+      res.status(500).json({ detail: 'Internal server error' });
+    }
   }
-});
+);
 
 export default router;
 
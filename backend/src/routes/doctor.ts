@@ -1,13 +1,76 @@
 import { Router, Request, Response } from 'express';
+import { once } from 'events';
 import { body, validationResult } from 'express-validator';
 import { authenticate } from '../middleware/auth';
 import { AppDataSource } from '../database/connection';
 import { Prescription } from '../models/Prescription';
-import { Diagnosis } from '../models/Diagnosis';
-import { User } from '../models/User';
+import { ListCursor, afterCursorSql, cursorTimestampSql } from '../utils/cursor';
 
 const router = Router();
 
+// Rows fetched per query when streaming the full prescription list
+const STREAM_PAGE_SIZE = 100;
+
+/**
+ * Wait for the response buffer to drain; false if the client disconnected first
+ * ('drain' never fires on a closed socket, so waiting on it alone can hang)
+ */
+async function waitForDrain(res: Response): Promise<boolean> {
+  if (res.destroyed) {
+    return false;
+  }
+
+  // Aborting removes whichever listener didn't fire
+  const controller = new AbortController();
+  try {
+    return await Promise.race([
+      once(res, 'drain', { signal: controller.signal }).then(() => true),
+      once(res, 'close', { signal: controller.signal }).then(() => false),
+    ]);
+  } finally {
+    controller.abort();
+  }
+}
+
+/**
+ * Doctor-facing view of a prescription with its patient and diagnosis
+ */
+function toDoctorPrescriptionView(prescription: Prescription) {
+  const diagnosis = prescription.diagnosis;
+
+  return {
+    id: prescription.id,
+    patient: {
+      id: prescription.user.id,
+      name: prescription.user.fullName,
+      email: prescription.user.email,
+    },
+    diagnosis: diagnosis
+      ? {
+          id: diagnosis.id,
+          severity: diagnosis.severity,
+          acne_type: diagnosis.acneType,
+          confidence: diagnosis.confidence,
+          lesion_counts: diagnosis.lesionCounts,
+          clinical_notes: diagnosis.clinicalNotes,
+          image_url: diagnosis.imageUrl,
+          created_at: diagnosis.createdAt.toISOString(),
+        }
+      : null,
+    prescription: {
+      severity: prescription.severity,
+      medications: prescription.medications,
+      lifestyle_recommendations: prescription.lifestyleRecommendations,
+      follow_up_instructions: prescription.followUpInstructions,
+      reasoning: prescription.reasoning,
+    },
+    status: prescription.status,
+    doctor_notes: prescription.doctorNotes,
+    approved_at: prescription.approvedAt?.toISOString(),
+    created_at: prescription.createdAt.toISOString(),
+  };
+}
+
 /**
  * Middleware to check if user is a doctor
  */
@@ -26,8 +89,6 @@ const requireDoctor = (req: Request, res: Response, next: any) => {
 router.get('/prescriptions/pending', authenticate, requireDoctor, async (req: Request, res: Response) => {
   try {
     const prescriptionRepository = AppDataSource.getRepository(Prescription);
-    const diagnosisRepository = AppDataSource.getRepository(Diagnosis);
-    const userRepository = AppDataSource.getRepository(User);
 
     const pendingPrescriptions = await prescriptionRepository.find({
       where: { status: 'pending' },
@@ -35,46 +96,8 @@ router.get('/prescriptions/pending', authenticate, requireDoctor, async (req: Re
       order: { createdAt: 'DESC' },
     });
 
-    const prescriptionsWithDetails = await Promise.all(
-      pendingPrescriptions.map(async (prescription) => {
-        const diagnosis = prescription.diagnosisId
-          ? await diagnosisRepository.findOne({
-              where: { id: prescription.diagnosisId },
-            })
-          : null;
-
-        return {
-          id: prescription.id,
-          patient: {
-            id: prescription.user.id,
-            name: prescription.user.fullName,
-            email: prescription.user.email,
-          },
-          diagnosis: diagnosis
-            ? {
-                id: diagnosis.id,
-                severity: diagnosis.severity,
-                acne_type: diagnosis.acneType,
-                confidence: diagnosis.confidence,
-                lesion_counts: diagnosis.lesionCounts,
-                clinical_notes: diagnosis.clinicalNotes,
-                image_url: diagnosis.imageUrl,
-                created_at: diagnosis.createdAt.toISOString(),
-              }
-            : null,
-          prescription: {
-            severity: prescription.severity,
-            medications: prescription.medications,
-            lifestyle_recommendations: prescription.lifestyleRecommendations,
-            follow_up_instructions: prescription.followUpInstructions,
-            reasoning: prescription.reasoning,
-          },
-          created_at: prescription.createdAt.toISOString(),
-        };
-      })
-    );
-
-    res.json(prescriptionsWithDetails);
+    // Diagnosis comes from the joined relation: no per-row query
+    res.json(pendingPrescriptions.map(toDoctorPrescriptionView));
   } catch (error) {
     console.error('Get pending prescriptions error:', error);
     res.status(500).json({ detail: 'Internal server error' });
@@ -203,59 +226,71 @@ router.post(
 router.get('/prescriptions', authenticate, requireDoctor, async (req: Request, res: Response) => {
   try {
     const prescriptionRepository = AppDataSource.getRepository(Prescription);
-    const diagnosisRepository = AppDataSource.getRepository(Diagnosis);
 
-    const prescriptions = await prescriptionRepository.find({
-      relations: ['user', 'diagnosis'],
-      order: { createdAt: 'DESC' },
-    });
+    // Stream the (unbounded) list as a JSON array, one keyset page at a time,
+    // so memory stays flat and the first rows go out before the last are read
+    let cursor: ListCursor | null = null;
+    let started = false;
+    let first = true;
 
-    const prescriptionsWithDetails = await Promise.all(
-      prescriptions.map(async (prescription) => {
-        const diagnosis = prescription.diagnosisId
-          ? await diagnosisRepository.findOne({
-              where: { id: prescription.diagnosisId },
-            })
-          : null;
-
-        return {
-          id: prescription.id,
-          patient: {
-            id: prescription.user.id,
-            name: prescription.user.fullName,
-            email: prescription.user.email,
-          },
-          diagnosis: diagnosis
-            ? {
-                id: diagnosis.id,
-                severity: diagnosis.severity,
-                acne_type: diagnosis.acneType,
-                confidence: diagnosis.confidence,
-                lesion_counts: diagnosis.lesionCounts,
-                clinical_notes: diagnosis.clinicalNotes,
-                image_url: diagnosis.imageUrl,
-                created_at: diagnosis.createdAt.toISOString(),
-              }
-            : null,
-          prescription: {
-            severity: prescription.severity,
-            medications: prescription.medications,
-            lifestyle_recommendations: prescription.lifestyleRecommendations,
-            follow_up_instructions: prescription.followUpInstructions,
-            reasoning: prescription.reasoning,
-          },
-          status: prescription.status,
-          doctor_notes: prescription.doctorNotes,
-          approved_at: prescription.approvedAt?.toISOString(),
-          created_at: prescription.createdAt.toISOString(),
-        };
-      })
-    );
-
-    res.json(prescriptionsWithDetails);
+    for (;;) {
+      // Client went away: stop paging through the table for nobody
+      if (res.destroyed) {
+        return;
+      }
+
+      const query = prescriptionRepository
+        .createQueryBuilder('prescription')
+        .leftJoinAndSelect('prescription.user', 'user')
+        .leftJoinAndSelect('prescription.diagnosis', 'diagnosis')
+        .addSelect(cursorTimestampSql('prescription.created_at'), 'cursor_created_at')
+        // Served by ix_prescriptions_created_id, so each page is an index range scan
+        .orderBy('prescription.created_at', 'DESC')
+        .addOrderBy('prescription.id', 'DESC')
+        .limit(STREAM_PAGE_SIZE);
+
+      if (cursor) {
+        query.where(afterCursorSql('prescription.created_at', 'prescription.id'), {
+          cursorCreatedAt: cursor.createdAt,
+          cursorId: cursor.id,
+        });
+      }
+
+      // Only many-to-one joins, so raw rows line up one-to-one with the entities
+      const { entities: page, raw } = await query.getRawAndEntities();
+
+      if (!started) {
+        res.type('json');
+        res.write('[');
+        started = true;
+      }
+
+      for (const prescription of page) {
+        const chunk = (first ? '' : ',') + JSON.stringify(toDoctorPrescriptionView(prescription));
+        first = false;
+        if (!res.write(chunk) && !(await waitForDrain(res))) {
+          return;
+        }
+      }
+
+      if (page.length < STREAM_PAGE_SIZE) {
+        break;
+      }
+      cursor = {
+        createdAt: raw[raw.length - 1].cursor_created_at,
+        id: page[page.length - 1].id,
+      };
+    }
+
+    res.end(']');
   } catch (error) {
     console.error('Get all prescriptions error:', error);
-    res.status(500).json({ detail: 'Internal server error' });
+    if (res.headersSent) {
+      // Part of the array is already out: abort so the client sees a truncated response
+      res.destroy();
+    } else {
+      res.status(500).json({ detail: 'Internal server error' });
+    }
   }
 });
 
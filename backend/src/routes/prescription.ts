@@ -1,16 +1,16 @@
 import { Router, Request, Response } from 'express';
-import { body, validationResult } from 'express-validator';
+import { body, query, validationResult } from 'express-validator';
 import { authenticate } from '../middleware/auth';
-import { AppDataSource } from '../database/connection';
-import { Diagnosis } from '../models/Diagnosis';
 import {
   generatePrescription,
   createPrescription,
   getPrescriptionById,
-  getPrescriptionByDiagnosisId,
+  getDiagnosisWithPrescription,
   listPrescriptions,
   translatePrescription,
+  PrescriptionListRow,
 } from '../services/prescriptionService';
+import { decodeCursor, toPage } from '../utils/cursor';
 
 const router = Router();
 
@@ -35,18 +35,16 @@ router.post(
       const { diagnosis_id, additional_notes } = req.body;
       const user = req.user!;
 
-      // Get diagnosis (user-specific)
-      const diagnosisRepository = AppDataSource.getRepository(Diagnosis);
-      const diagnosis = await diagnosisRepository.findOne({
-        where: { id: diagnosis_id, userId: user.id },
-      });
+      // Get diagnosis (user-specific) and any existing prescription in one round-trip
+      const { diagnosis, prescription: existing } = await getDiagnosisWithPrescription(
+        diagnosis_id,
+        user.id
+      );
 
       if (!diagnosis) {
         return res.status(404).json({ detail: 'Diagnosis not found' });
       }
 
-      // Check if prescription already exists
-      const existing = await getPrescriptionByDiagnosisId(diagnosis_id, user.id);
       if (existing) {
         // Patients can only see approved prescriptions
         if (user.role === 'patient' && existing.status !== 'approved') {
@@ -154,39 +152,67 @@ router.get('/:id', authenticate, async (req: Request, res: Response) => {
   }
 });
 
+/**
+ * List view of a prescription
+ * Reasoning, lifestyle and follow-up text are only returned by GET /:id
+ */
+function toPrescriptionListView(p: PrescriptionListRow) {
+  return {
+    id: p.id,
+    diagnosis_id: p.diagnosisId,
+    severity: p.severity,
+    medications: p.medications,
+    status: p.status,
+    doctor_notes: p.doctorNotes,
+    // Dates are left to JSON.stringify, which calls Date#toJSON natively
+    approved_at: p.approvedAt ?? undefined,
+    created_at: p.createdAt,
+  };
+}
+
 /**
  * GET /api/v1/prescription
- * List all prescriptions for current user (all statuses for patients: approved, rejected, pending)
+ * List prescriptions for current user, newest first (all statuses for patients: approved, rejected, pending)
+ * Without query params, returns every prescription as an array. With limit (default 50,
+ * max 100) and/or cursor, returns one page as { items, next_cursor }; pass
+ * next_cursor back as cursor until it is null.
  */
-router.get('/', authenticate, async (req: Request, res: Response) => {
-  try {
-    const user = req.user!;
-    const prescriptions = await listPrescriptions(user.id);
-
-    // Patients can see all their prescriptions (approved, rejected, pending)
-    // Doctors can see all prescriptions
-    // No filtering needed - return all prescriptions for the user
-
-    res.json(
-      prescriptions.map((p) => ({
-        id: p.id,
-        diagnosis_id: p.diagnosisId,
-        severity: p.severity,
-        medications: p.medications,
-        lifestyle_recommendations: p.lifestyleRecommendations,
-        follow_up_instructions: p.followUpInstructions,
-        reasoning: p.reasoning,
-        status: p.status,
-        doctor_notes: p.doctorNotes,
-        approved_at: p.approvedAt?.toISOString(),
-        created_at: p.createdAt.toISOString(),
-      }))
-    );
-  } catch (error) {
-    console.error('List prescriptions error:', error);
-    res.status(500).json({ detail: 'Internal server error' });
+router.get(
+  '/',
+  authenticate,
+  [
+    query('limit').optional().isInt({ min: 1, max: 100 }).toInt(),
+    query('cursor')
+      .optional()
+      .isString()
+      .custom((value: string) => decodeCursor(value) !== null)
+      .withMessage('Invalid cursor'),
+  ],
+  async (req: Request, res: Response) => {
+    try {
+      const errors = validationResult(req);
+      if (!errors.isEmpty()) {
+        return res.status(400).json({ detail: errors.array() });
+      }
+
+      const user = req.user!;
+
+      if (req.query.limit === undefined && req.query.cursor === undefined) {
+        const prescriptions = await listPrescriptions(user.id);
+        return res.json(prescriptions.map(toPrescriptionListView));
+      }
+
+      const limit = (req.query.limit as unknown as number | undefined) ?? 50;
+      const cursor = req.query.cursor ? decodeCursor(req.query.cursor as string)! : undefined;
+      const { items, nextCursor } = toPage(await listPrescriptions(user.id, limit, cursor), limit);
+
+      res.json({ items: items.map(toPrescriptionListView), next_cursor: nextCursor });
+    } catch (error) {
+      console.error('List prescriptions error:', error);
+      res.status(500).json({ detail: 'Internal server error' });
+    }
   }
-});
+);
 
 /**
  * POST /api/v1/prescription/translate
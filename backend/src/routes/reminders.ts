@@ -1,19 +1,39 @@
 import { Router, Request, Response } from 'express';
-import { body, validationResult } from 'express-validator';
+import { body, query, validationResult } from 'express-validator';
 import { authenticate } from '../middleware/auth';
 import {
   createReminder,
+  createReminders,
   getReminderById,
   listReminders,
   updateReminder,
   deleteReminder,
+  ReminderListRow,
 } from '../services/reminderService';
 import { AppDataSource } from '../database/connection';
 import { Reminder } from '../models/Reminder';
 import { Prescription } from '../models/Prescription';
+import { decodeCursor, toPage } from '../utils/cursor';
 
 const router = Router();
 
+// Reminder schedule per canonical frequency, checked in keyword order
+// ("twice" wins over "three", which wins over "night")
+const FREQUENCY_SCHEDULES: { keyword: string; frequency: string; times: string[] }[] = [
+  { keyword: 'twice', frequency: 'twice_daily', times: ['09:00', '21:00'] },
+  { keyword: 'three', frequency: 'three_times_daily', times: ['09:00', '14:00', '21:00'] },
+  { keyword: 'night', frequency: 'once_daily', times: ['21:00'] },
+];
+const DEFAULT_SCHEDULE = { frequency: 'once_daily', times: ['09:00'] };
+
+/**
+ * Map a free-text medication frequency ("Twice daily", "Once daily at night") to a schedule
+ */
+function scheduleForFrequency(freqText: string): { frequency: string; times: string[] } {
+  const freq = freqText.toLowerCase();
+  return FREQUENCY_SCHEDULES.find((schedule) => freq.includes(schedule.keyword)) ?? DEFAULT_SCHEDULE;
+}
+
 /**
  * POST /api/v1/reminders/create
  * Create a new reminder (alias for POST /reminders)
@@ -67,34 +87,67 @@ router.post(
   }
 );
 
+/**
+ * List view of a reminder
+ */
+function toReminderListView(r: ReminderListRow) {
+  return {
+    id: r.id,
+    prescription_id: r.prescriptionId,
+    title: r.title,
+    message: r.message,
+    message_telugu: r.messageTelugu,
+    frequency: r.frequency,
+    times: r.times,
+    status: r.status,
+    total_acknowledged: r.totalAcknowledged,
+    created_at: r.createdAt,
+  };
+}
+
 /**
  * GET /api/v1/reminders
- * List all reminders for current user
+ * List reminders for current user, newest first
+ * Without query params, returns every reminder as an array. With limit (default 50,
+ * max 100) and/or cursor, returns one page as { items, next_cursor }; pass
+ * next_cursor back as cursor until it is null.
  */
-router.get('/', authenticate, async (req: Request, res: Response) => {
-  try {
-    const user = req.user!;
-    const reminders = await listReminders(user.id);
-
-    res.json(
-      reminders.map((r) => ({
-        id: r.id,
-        prescription_id: r.prescriptionId,
-        title: r.title,
-        message: r.message,
-        message_telugu: r.messageTelugu,
-        frequency: r.frequency,
-        times: r.times,
-        status: r.status,
-        total_acknowledged: r.totalAcknowledged,
-        created_at: r.createdAt.toISOString(),
-      }))
-    );
-  } catch (error) {
-    console.error('List reminders error:', error);
-    res.status(500).json({ detail: 'Internal server error' });
+router.get(
+  '/',
+  authenticate,
+  [
+    query('limit').optional().isInt({ min: 1, max: 100 }).toInt(),
+    query('cursor')
+      .optional()
+      .isString()
+      .custom((value: string) => decodeCursor(value) !== null)
+      .withMessage('Invalid cursor'),
+  ],
+  async (req: Request, res: Response) => {
+    try {
+      const errors = validationResult(req);
+      if (!errors.isEmpty()) {
+        return res.status(400).json({ detail: errors.array() });
+      }
+
+      const user = req.user!;
+
+      if (req.query.limit === undefined && req.query.cursor === undefined) {
+        const reminders = await listReminders(user.id);
+        return res.json(reminders.map(toReminderListView));
+      }
+
+      const limit = (req.query.limit as unknown as number | undefined) ?? 50;
+      const cursor = req.query.cursor ? decodeCursor(req.query.cursor as string)! : undefined;
+      const { items, nextCursor } = toPage(await listReminders(user.id, limit, cursor), limit);
+
+      res.json({ items: items.map(toReminderListView), next_cursor: nextCursor });
+    } catch (error) {
+      console.error('List reminders error:', error);
+      res.status(500).json({ detail: 'Internal server error' });
+    }
   }
-});
+);
 
 /**
  * GET /api/v1/reminders/:id
@@ -255,44 +308,30 @@ router.post('/auto-schedule/:prescription_id', authenticate, async (req: Request
       return res.status(404).json({ detail: 'Prescription not found' });
     }
 
-    const createdReminders: any[] = [];
-
-    for (const med of prescription.medications) {
-      // Determine times based on frequency
-      const freq = ((med as any).frequency || 'once daily').toLowerCase();
-      let times: string[];
-      let frequency: string;
-
-      if (freq.includes('twice')) {
-        times = ['09:00', '21:00'];
-        frequency = 'twice_daily';
-      } else if (freq.includes('three')) {
-        times = ['09:00', '14:00', '21:00'];
-        frequency = 'three_times_daily';
-      } else {
-        times = freq.includes('night') ? ['21:00'] : ['09:00'];
-        frequency = 'once_daily';
-      }
+    const reminderData = prescription.medications.map((med) => {
+      const { frequency, times } = scheduleForFrequency((med as any).frequency || 'once daily');
 
-      const reminder = await createReminder(user.id, {
+      return {
         prescriptionId: prescription_id,
         title: `Medication: ${(med as any).name}`,
         message: `Time to apply/take ${(med as any).name}. ${(med as any).instructions || ''}`,
         messageTelugu: undefined,
         frequency,
-        times,
-      });
+        times: [...times],
+      };
+    });
 
-      createdReminders.push({
-        id: reminder.id,
-        prescription_id: prescription_id,
-        title: reminder.title,
-        message: reminder.message,
-        frequency,
-        times,
-        status: reminder.status,
-      });
-    }
+    const reminders = await createReminders(user.id, reminderData);
+
+    const createdReminders = reminders.map((reminder) => ({
+      id: reminder.id,
+      prescription_id: prescription_id,
+      title: reminder.title,
+      message: reminder.message,
+      frequency: reminder.frequency,
+      times: reminder.times,
+      status: reminder.status,
+    }));
 
     res.json({
       prescription_id,
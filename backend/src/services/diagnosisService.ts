@@ -1,6 +1,7 @@
 import { AppDataSource } from '../database/connection';
 import { Diagnosis } from '../models/Diagnosis';
-import { v4 as uuidv4 } from 'uuid';
+import { uuidv7 } from '../utils/id';
+import { ListCursor, afterCursorSql, cursorTimestampSql } from '../utils/cursor';
 
 /**
  * Create a diagnosis record
@@ -24,7 +25,7 @@ export async function createDiagnosis(
   const diagnosisRepository = AppDataSource.getRepository(Diagnosis);
 
   const diagnosis = diagnosisRepository.create({
-    id: uuidv4().substring(0, 8),
+    id: uuidv7(),
     userId,
     ...data,
   });
@@ -47,16 +48,89 @@ export async function getDiagnosisById(
 }
 
 /**
- * List diagnoses for a user
+ * Diagnosis list row: only the columns the list endpoint returns,
+ * read as plain objects instead of hydrated entities
  */
-export async function listDiagnoses(userId: string): Promise<Diagnosis[]> {
-  const diagnosisRepository = AppDataSource.getRepository(Diagnosis);
-  return diagnosisRepository.find({
-    where: { userId },
-    order: { createdAt: 'DESC' },
-  });
+export interface DiagnosisListRow {
+  id: string;
+  severity: string;
+  acneType: string | null;
+  confidence: number;
+  severityScores: Record<string, number>;
+  lesionCounts: Record<string, number>;
+  affectedAreas: string[];
+  clinicalNotes: string;
+  recommendedUrgency: string;
+  imageUrl: string;
+  createdAt: Date;
+  clinicalMetadata: Record<string, any>;
+  cursorCreatedAt: string;
 }
 
+/**
+ * List diagnoses for a user, newest first
+ * With a limit, fetches limit + 1 rows (see toPage) after the optional cursor;
+ * without one, returns every row
+ */
+export async function listDiagnoses(
+  userId: string,
+  limit?: number,
+  cursor?: ListCursor
+): Promise<DiagnosisListRow[]> {
+  const query = AppDataSource.getRepository(Diagnosis)
+    .createQueryBuilder('d')
+    .select([
+      'd.id AS "id"',
+      'd.severity AS "severity"',
+      'd.acne_type AS "acneType"',
+      'd.confidence AS "confidence"',
+      'd.severity_scores AS "severityScores"',
+      'd.lesion_counts AS "lesionCounts"',
+      'd.affected_areas AS "affectedAreas"',
+      'd.clinical_notes AS "clinicalNotes"',
+      'd.recommended_urgency AS "recommendedUrgency"',
+      'd.image_url AS "imageUrl"',
+      'd.created_at AS "createdAt"',
+      'd.clinical_metadata AS "clinicalMetadata"',
+      `${cursorTimestampSql('d.created_at')} AS "cursorCreatedAt"`,
+    ])
+    .where('d.user_id = :userId', { userId });
+
+  if (cursor) {
+    query.andWhere(afterCursorSql('d.created_at', 'd.id'), {
+      cursorCreatedAt: cursor.createdAt,
+      cursorId: cursor.id,
+    });
+  }
+
+  // id breaks ties between rows sharing a created_at
+  query.orderBy('d.created_at', 'DESC').addOrderBy('d.id', 'DESC');
+  if (limit !== undefined) {
+    query.limit(limit + 1);
+  }
+
+  return query.getRawMany<DiagnosisListRow>();
+}
+
+// Severity-specific opening sentence; typeInfo is " (Type: X)" or ""
+type SeverityNoteTemplate = (total: number, typeInfo: string) => string;
+
+const SEVERITY_NOTE_TEMPLATES: Record<string, SeverityNoteTemplate> = {
+  mild: (total, typeInfo) =>
+    `Mild acne detected${typeInfo} with ${total} total lesions (primarily comedones and papules).`,
+  moderate: (total, typeInfo) =>
+    `Moderate acne${typeInfo} with ${total} total lesions including papules and pustules.`,
+  severe: (total, typeInfo) =>
+    `Severe acne${typeInfo} with ${total} total lesions including numerous pustules and nodules.`,
+  very_severe: (total, typeInfo) =>
+    `Very severe cystic acne${typeInfo} with ${total} total lesions including nodules and cysts. Requires aggressive treatment.`,
+};
+
+const LESION_DETAIL_RULES: ReadonlyArray<[(counts: Record<string, number>) => boolean, string]> = [
+  [(counts) => counts.nodules > 0 || counts.cysts > 0, 'nodular/cystic lesions present'],
+  [(counts) => counts.pustules > 5, 'multiple inflammatory pustules'],
+];
+
 /**
  * Generate clinical notes based on severity, type, and lesion counts
  */
@@ -67,41 +141,34 @@ export function generateClinicalNotes(
   acneType?: string | null
 ): string {
   const notes: string[] = [];
-  const total = Object.values(lesionCounts).reduce((sum, count) => sum + count, 0);
+  let total = 0;
+  for (const key in lesionCounts) {
+    total += lesionCounts[key];
+  }
 
   // Generate severity-specific notes
   if (severity === 'clear') {
-    if (total === 0) {
-      notes.push('No significant acne lesions detected.');
-    } else {
-      notes.push('Minimal acne lesions detected. Skin appears relatively clear.');
-    }
+    notes.push(
+      total === 0
+        ? 'No significant acne lesions detected.'
+        : 'Minimal acne lesions detected. Skin appears relatively clear.'
+    );
   } else {
     // Add acne type information if available
     const typeInfo = acneType ? ` (Type: ${acneType})` : '';
-    
-    if (severity === 'mild') {
-      notes.push(`Mild acne detected${typeInfo} with ${total} total lesions (primarily comedones and papules).`);
-    } else if (severity === 'moderate') {
-      notes.push(`Moderate acne${typeInfo} with ${total} total lesions including papules and pustules.`);
-    } else if (severity === 'severe') {
-      notes.push(`Severe acne${typeInfo} with ${total} total lesions including numerous pustules and nodules.`);
-    } else if (severity === 'very_severe') {
-      notes.push(`Very severe cystic acne${typeInfo} with ${total} total lesions including nodules and cysts. Requires aggressive treatment.`);
-    } else {
-      notes.push(`Acne severity: ${severity}${typeInfo}. Total lesions detected: ${total}.`);
-    }
+    const template = SEVERITY_NOTE_TEMPLATES[severity];
+    notes.push(
+      template
+        ? template(total, typeInfo)
+        : `Acne severity: ${severity}${typeInfo}. Total lesions detected: ${total}.`
+    );
   }
 
   // Add specific lesion breakdown
   if (total > 0) {
-    const lesionDetails: string[] = [];
-    if (lesionCounts.nodules > 0 || lesionCounts.cysts > 0) {
-      lesionDetails.push('nodular/cystic lesions present');
-    }
-    if (lesionCounts.pustules > 5) {
-      lesionDetails.push('multiple inflammatory pustules');
-    }
+    const lesionDetails = LESION_DETAIL_RULES.filter(([applies]) => applies(lesionCounts)).map(
+      ([, detail]) => detail
+    );
     if (lesionDetails.length > 0) {
       notes.push('Note: ' + lesionDetails.join(', ') + '.');
     }
@@ -115,74 +182,44 @@ export function generateClinicalNotes(
   return notes.join(' ');
 }
 
+const URGENCY_BY_SEVERITY: Readonly<Record<string, string>> = Object.freeze({
+  clear: 'routine',
+  mild: 'routine',
+  moderate: 'soon',
+  severe: 'soon',
+  very_severe: 'urgent',
+});
+
 /**
  * Get urgency based on severity
  */
 export function getUrgency(severity: string): string {
-  const urgencyMap: Record<string, string> = {
-    clear: 'routine',
-    mild: 'routine',
-    moderate: 'soon',
-    severe: 'soon',
-    very_severe: 'urgent',
-  };
-  return urgencyMap[severity] || 'routine';
+  return URGENCY_BY_SEVERITY[severity] || 'routine';
 }
 
+const LESION_TYPES = ['comedones', 'papules', 'pustules', 'nodules', 'cysts'] as const;
+
+// Base lesion counts per severity, in LESION_TYPES order (scaled by image variance)
+const LESION_BASE_COUNTS: Readonly<Record<string, readonly number[]>> = Object.freeze({
+  clear: [0, 0, 0, 0, 0],
+  mild: [5, 3, 1, 0, 0],
+  moderate: [15, 10, 5, 0, 0],
+  severe: [25, 20, 15, 3, 0],
+  very_severe: [30, 25, 20, 10, 5],
+});
+const DEFAULT_LESION_BASE_COUNTS: readonly number[] = [20, 15, 8, 2, 1];
+
 /**
  * Detect lesions based on severity (heuristic)
  */
 export function detectLesions(severity: string, imageVariance?: number): Record<string, number> {
   const scale = imageVariance ? Math.min(imageVariance / 1000, 1.0) : 0.5;
+  const baseCounts = LESION_BASE_COUNTS[severity] || DEFAULT_LESION_BASE_COUNTS;
 
-  if (severity === 'clear') {
-    return {
-      comedones: 0,
-      papules: 0,
-      pustules: 0,
-      nodules: 0,
-      cysts: 0,
-    };
-  } else if (severity === 'mild') {
-    return {
-      comedones: Math.floor(5 * scale),
-      papules: Math.floor(3 * scale),
-      pustules: Math.floor(1 * scale),
-      nodules: 0,
-      cysts: 0,
-    };
-  } else if (severity === 'moderate') {
-    return {
-      comedones: Math.floor(15 * scale),
-      papules: Math.floor(10 * scale),
-      pustules: Math.floor(5 * scale),
-      nodules: 0,
-      cysts: 0,
-    };
-  } else if (severity === 'severe') {
-    return {
-      comedones: Math.floor(25 * scale),
-      papules: Math.floor(20 * scale),
-      pustules: Math.floor(15 * scale),
-      nodules: Math.floor(3 * scale),
-      cysts: 0,
-    };
-  } else if (severity === 'very_severe') {
-    return {
-      comedones: Math.floor(30 * scale),
-      papules: Math.floor(25 * scale),
-      pustules: Math.floor(20 * scale),
-      nodules: Math.floor(10 * scale),
-      cysts: Math.floor(5 * scale),
-    };
-  } else {
-    return {
-      comedones: Math.floor(20 * scale),
-      papules: Math.floor(15 * scale),
-      pustules: Math.floor(8 * scale),
-      nodules: Math.floor(2 * scale),
-      cysts: Math.floor(1 * scale),
-    };
-  }
+  const counts: Record<string, number> = {};
+  LESION_TYPES.forEach((lesionType, i) => {
+    counts[lesionType] = Math.floor(baseCounts[i] * scale);
+  });
+  return counts;
 }
 
@@ -1,10 +1,48 @@
 import { GoogleGenerativeAI } from '@google/generative-ai';
 import { config } from '../config';
 
-// Initialize Gemini AI
+// Initialize Gemini AI once at startup rather than per request
 const genAI = config.geminiApiKey
   ? new GoogleGenerativeAI(config.geminiApiKey)
   : null;
+const geminiModel = genAI
+  ? genAI.getGenerativeModel({ model: 'gemini-2.5-flash' })
+  : null;
+
+export interface PrescriptionContent {
+  medications: any[];
+  lifestyleRecommendations: string[];
+  followUpInstructions: string;
+}
+
+/**
+ * Parse a JSON reply, stripping markdown code fences if the model added them
+ */
+function parseJsonResponse(text: string): any {
+  let jsonText = text.trim();
+  if (jsonText.startsWith('```json')) {
+    jsonText = jsonText.replace(/```json\n?/g, '').replace(/```\n?/g, '');
+  } else if (jsonText.startsWith('```')) {
+    jsonText = jsonText.replace(/```\n?/g, '');
+  }
+  return JSON.parse(jsonText);
+}
+
+/**
+ * Keep the original value for any field the model didn't return
+ */
+function mergeTranslation(original: PrescriptionContent, data: any): PrescriptionContent {
+  return {
+    medications: Array.isArray(data?.medications)
+      ? data.medications
+      : original.medications,
+    lifestyleRecommendations: Array.isArray(data?.lifestyleRecommendations)
+      ? data.lifestyleRecommendations
+      : original.lifestyleRecommendations,
+    followUpInstructions:
+      data?.followUpInstructions || original.followUpInstructions,
+  };
+}
 
 /**
  * Generate prescription using Gemini API based on severity and type
@@ -21,13 +59,12 @@ export async function generatePrescriptionWithGemini(
   followUpInstructions: string;
   reasoning: string;
 }> {
-  if (!genAI) {
+  if (!geminiModel) {
     throw new Error(
       'Gemini API key is not configured. Please set GEMINI_API_KEY environment variable.'
     );
   }
 
-  const model = genAI.getGenerativeModel({ model: 'gemini-2.5-flash' });
 
   const severityLabels: Record<string, string> = {
     clear: 'Clear (no acne)',
@@ -176,18 +213,11 @@ ${treatmentGuidelines}
 Return ONLY valid JSON. Do not include any markdown formatting, code blocks, or explanatory text outside the JSON structure.`;
 
   try {
-    const result = await model.generateContent(prompt);
+    const result = await geminiModel.generateContent(prompt);
     const response = await result.response;
     const text = response.text();
 
-    let jsonText = text.trim();
-    if (jsonText.startsWith('```json')) {
-      jsonText = jsonText.replace(/```json\n?/g, '').replace(/```\n?/g, '');
-    } else if (jsonText.startsWith('```')) {
-      jsonText = jsonText.replace(/```\n?/g, '');
-    }
-
-    const prescriptionData = JSON.parse(jsonText);
+    const prescriptionData = parseJsonResponse(text);
 
     return {
       medications: Array.isArray(prescriptionData.medications)
@@ -216,24 +246,15 @@ Return ONLY valid JSON. Do not include any markdown formatting, code blocks, or
  * Translate an existing prescription into a target language while preserving structure.
  */
 export async function translatePrescriptionWithGemini(
-  content: {
-    medications: any[];
-    lifestyleRecommendations: string[];
-    followUpInstructions: string;
-  },
+  content: PrescriptionContent,
   targetLanguage: 'hi' | 'te'
-): Promise<{
-  medications: any[];
-  lifestyleRecommendations: string[];
-  followUpInstructions: string;
-}> {
-  if (!genAI) {
+): Promise<PrescriptionContent> {
+  if (!geminiModel) {
     throw new Error(
       'Gemini API key is not configured. Please set GEMINI_API_KEY environment variable.'
     );
   }
 
-  const model = genAI.getGenerativeModel({ model: 'gemini-2.5-flash' });
   const languageName = targetLanguage === 'hi' ? 'Hindi' : 'Telugu';
 
   const prompt = `You are a precise medical translator.
@@ -266,29 +287,13 @@ Return JSON with this exact structure:
 }`;
 
   try {
-    const result = await model.generateContent(prompt);
+    const result = await geminiModel.generateContent(prompt);
     const response = await result.response;
     const text = response.text();
 
-    let jsonText = text.trim();
-    if (jsonText.startsWith('```json')) {
-      jsonText = jsonText.replace(/```json\n?/g, '').replace(/```\n?/g, '');
-    } else if (jsonText.startsWith('```')) {
-      jsonText = jsonText.replace(/```\n?/g, '');
-    }
-
-    const data = JSON.parse(jsonText);
+    const data = parseJsonResponse(text);
 
-    return {
-      medications: Array.isArray(data.medications)
-        ? data.medications
-        : content.medications,
-      lifestyleRecommendations: Array.isArray(data.lifestyleRecommendations)
-        ? data.lifestyleRecommendations
-        : content.lifestyleRecommendations,
-      followUpInstructions:
-        data.followUpInstructions || content.followUpInstructions,
-    };
+    return mergeTranslation(content, data);
   } catch (error: any) {
     console.error('Gemini translation error:', error);
     throw new Error(
@@ -298,3 +303,56 @@ Return JSON with this exact structure:
 }
 
 
+
+/**
+ * Translate several prescriptions into the same language with one request.
+ * The reply must be a JSON array in the same order as the input.
+ */
+export async function translatePrescriptionsWithGemini(
+  contents: PrescriptionContent[],
+  targetLanguage: 'hi' | 'te'
+): Promise<PrescriptionContent[]> {
+  if (contents.length === 1) {
+    return [await translatePrescriptionWithGemini(contents[0], targetLanguage)];
+  }
+
+  if (!geminiModel) {
+    throw new Error(
+      'Gemini API key is not configured. Please set GEMINI_API_KEY environment variable.'
+    );
+  }
+
+  const languageName = targetLanguage === 'hi' ? 'Hindi' : 'Telugu';
+
+  const prompt = `You are a precise medical translator.
+Translate each of the following ${contents.length} acne treatment prescriptions into ${languageName}.
+
+Requirements:
+- Keep medicine names, strengths (like "0.1%", "2.5%", "100mg") and technical terms accurate.
+- Preserve the JSON structure of every prescription exactly.
+- Translate all patient-facing text (instructions, recommendations, follow-up) into ${languageName}.
+- Return a JSON array with exactly ${contents.length} items, in the same order as the input.
+- Return ONLY valid JSON, no markdown or extra text.
+
+Original prescriptions JSON array:
+${JSON.stringify(contents, null, 2)}`;
+
+  try {
+    const result = await geminiModel.generateContent(prompt);
+    const response = await result.response;
+    const data = parseJsonResponse(response.text());
+
+    if (!Array.isArray(data) || data.length !== contents.length) {
+      throw new Error(
+        `Expected ${contents.length} translations, got ${Array.isArray(data) ? data.length : 'non-array'}`
+      );
+    }
+
+    return contents.map((content, i) => mergeTranslation(content, data[i]));
+  } catch (error: any) {
+    console.error('Gemini batch translation error:', error);
+    throw new Error(
+      `Failed to translate prescriptions with Gemini: ${error.message}`
+    );
+  }
+}
@@ -0,0 +1,138 @@
+import * as ort from 'onnxruntime-node';
+import { Tensor } from 'onnxruntime-node';
+import { config } from '../../config';
+import { logger } from '../../utils/logger';
+import { Semaphore } from '../../utils/semaphore';
+
+const MAX_BATCH_SIZE = 8;
+const MAX_WAIT_MS = 15;
+const DEBUG_INFERENCE = logger.isDebugEnabled();
+
+// Each session.run() gets cpus / ML_WORKERS intra-op threads (see inference.ts), so
+// at most ML_WORKERS runs, across all models, may execute at once
+const inferenceSlots = new Semaphore(Math.max(1, config.mlWorkers));
+
+// ORT's messages when a graph exported with a fixed batch of 1 is fed a larger batch:
+// "Got invalid dimensions for input ... Expected: 1" or a Reshape that can't fit it
+const BATCH_SHAPE_ERROR = /invalid dimensions|cannot be reshaped|shape mismatch/i;
+
+/**
+ * Whether a batched run failed because the model rejects the batch dimension,
+ * as opposed to a transient or per-input failure
+ */
+function isBatchShapeError(error: unknown): boolean {
+  return BATCH_SHAPE_ERROR.test(error instanceof Error ? error.message : String(error));
+}
+
+interface PendingInference {
+  input: Tensor;
+  resolve: (logits: Float32Array) => void;
+  reject: (error: unknown) => void;
+}
+
+/**
+ * Micro-batching wrapper around an ONNX session
+ * Collects concurrent single-image requests (up to MAX_BATCH_SIZE, or for
+ * at most MAX_WAIT_MS) and runs them as one batched inference
+ */
+export class MicroBatcher {
+  private queue: PendingInference[] = [];
+  private timer: NodeJS.Timeout | null = null;
+  // Cleared once the model rejects a batch dimension above 1 (fixed-batch export)
+  private supportsBatching = true;
+  // Resolved once; every run feeds the same input and fetches only this output
+  private readonly inputName: string;
+  private readonly outputName: string;
+
+  constructor(private readonly session: ort.InferenceSession) {
+    this.inputName = session.inputNames[0];
+    this.outputName = session.outputNames[0];
+  }
+
+  /**
+   * Queue a [1, C, H, W] input and resolve with its output logits
+   */
+  run(input: Tensor): Promise<Float32Array> {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ input, resolve, reject });
+
+      if (this.queue.length >= MAX_BATCH_SIZE) {
+        this.flush();
+      } else if (!this.timer) {
+        this.timer = setTimeout(() => this.flush(), MAX_WAIT_MS);
+      }
+    });
+  }
+
+  private flush(): void {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+
+    const batch = this.queue.splice(0, MAX_BATCH_SIZE);
+    if (batch.length > 0) {
+      void this.runBatch(batch);
+    }
+
+    if (this.queue.length > 0) {
+      this.timer = setTimeout(() => this.flush(), MAX_WAIT_MS);
+    }
+  }
+
+  private async runBatch(batch: PendingInference[]): Promise<void> {
+    if (batch.length === 1 || !this.supportsBatching) {
+      await Promise.all(batch.map((item) => this.runSingle(item)));
+      return;
+    }
+
+    try {
+      const sampleDims = batch[0].input.dims.slice(1);
+      const sampleSize = sampleDims.reduce((a, b) => a * b, 1);
+      const stacked = new Float32Array(batch.length * sampleSize);
+      batch.forEach((item, i) => {
+        stacked.set(item.input.data as Float32Array, i * sampleSize);
+      });
+
+      const logits = await this.infer(new Tensor('float32', stacked, [batch.length, ...sampleDims]));
+      const numClasses = logits.length / batch.length;
+      batch.forEach((item, i) => {
+        // Views into the batch output, not copies
+        item.resolve(logits.subarray(i * numClasses, (i + 1) * numClasses));
+      });
+    } catch (error) {
+      if (!isBatchShapeError(error)) {
+        // Anything else may be transient: fail only this batch and keep batching
+        logger.warn('Batched inference failed', { batchSize: batch.length, error });
+        batch.forEach((item) => item.reject(error));
+        return;
+      }
+
+      logger.warn('Model rejects batched input, falling back to batch size 1', { error });
+      this.supportsBatching = false;
+      await Promise.all(batch.map((item) => this.runSingle(item)));
+    }
+  }
+
+  private async runSingle(item: PendingInference): Promise<void> {
+    try {
+      item.resolve(await this.infer(item.input));
+    } catch (error) {
+      item.reject(error);
+    }
+  }
+
+  private async infer(input: Tensor): Promise<Float32Array> {
+    const results = await inferenceSlots.run(() =>
+      this.session.run({ [this.inputName]: input }, [this.outputName])
+    );
+    const output = results[this.outputName];
+    if (!output || !output.data) {
+      throw new Error('Model returned no output');
+    }
+    if (DEBUG_INFERENCE) {
+      logger.debug('Model output', { shape: output.dims, length: output.data.length });
+    }
+    return output.data as Float32Array;
+  }
+}
@@ -1,8 +1,12 @@
 import * as ort from 'onnxruntime-node';
-import { join } from 'path';
-import { existsSync } from 'fs';
-import { preprocessImage } from './preprocess';
+import { basename, join } from 'path';
+import { existsSync, readFileSync } from 'fs';
+import { cpus } from 'os';
+import { preprocessImage, IMAGE_SIZE } from './preprocess';
+import { MicroBatcher } from './batcher';
 import { Tensor } from 'onnxruntime-node';
+import { config } from '../../config';
+import { logger } from '../../utils/logger';
 
 // Model paths - ONNX models should be in backend/model after conversion
 const MODEL_DIR = join(process.cwd(), 'model');
@@ -10,11 +14,95 @@ const BINARY_MODEL_PATH = join(MODEL_DIR, 'acne_binary_efficientnet_b0_best.onnx
 const SEVERITY_MODEL_PATH = join(MODEL_DIR, 'acne_severity_efficientnet_b0_best.onnx');
 const TYPE_MODEL_PATH = join(MODEL_DIR, 'acne_type_best.onnx');
 
+// session.run() executes on the libuv threadpool; split the cores between
+// concurrent inferences instead of letting each one grab every core
+const INTRA_OP_NUM_THREADS = Math.max(1, Math.floor(cpus().length / Math.max(1, config.mlWorkers)));
+
+// Per-request logits/probability dumps are only built at debug level
+const DEBUG_INFERENCE = logger.isDebugEnabled();
+
 // Lazy-loaded model sessions
 let binarySession: ort.InferenceSession | null = null;
 let severitySession: ort.InferenceSession | null = null;
 let typeSession: ort.InferenceSession | null = null;
 
+/**
+ * Pick the model file to load: the INT8 variant (<name>.int8.onnx) when
+ * ML_INT8 is enabled, otherwise the offline-optimized copy (<name>.opt.onnx)
+ * written by the conversion script, so startup only has the machine-specific
+ * optimizations left to apply
+ */
+function resolveModelPath(modelPath: string): string {
+  // INT8 is opt-in: on CPUs without VNNI the int8 kernels can be slower than FP32
+  const quantizedPath = modelPath.replace(/\.onnx$/, '.int8.onnx');
+  if (config.mlInt8 && existsSync(quantizedPath)) {
+    return quantizedPath;
+  }
+
+  const optimizedPath = modelPath.replace(/\.onnx$/, '.opt.onnx');
+  return existsSync(optimizedPath) ? optimizedPath : modelPath;
+}
+
+/**
+ * Build session options, applying the <name>.session_options.json sidecar
+ * written by the conversion script when present
+ */
+function loadSessionOptions(modelPath: string): ort.InferenceSession.SessionOptions {
+  const options: ort.InferenceSession.SessionOptions = {
+    executionProviders: ['cpu'], // Use CPU (can add 'cuda' if GPU available)
+    intraOpNumThreads: INTRA_OP_NUM_THREADS,
+    interOpNumThreads: 1,
+    executionMode: 'sequential',
+    enableCpuMemArena: true,
+    enableMemPattern: true,
+  };
+
+  const sidecarPath = modelPath.replace(/\.onnx$/, '.session_options.json');
+  if (!existsSync(sidecarPath)) {
+    return options;
+  }
+
+  try {
+    const sidecar = JSON.parse(readFileSync(sidecarPath, 'utf-8'));
+    if (sidecar.execution_mode === 'sequential' || sidecar.execution_mode === 'parallel') {
+      options.executionMode = sidecar.execution_mode;
+    }
+    if (typeof sidecar.inter_op_num_threads === 'number') {
+      options.interOpNumThreads = sidecar.inter_op_num_threads;
+    }
+    if (typeof sidecar.enable_cpu_mem_arena === 'boolean') {
+      options.enableCpuMemArena = sidecar.enable_cpu_mem_arena;
+    }
+    if (typeof sidecar.enable_mem_pattern === 'boolean') {
+      options.enableMemPattern = sidecar.enable_mem_pattern;
+    }
+    if (['disabled', 'basic', 'extended', 'all'].includes(sidecar.graph_optimization_level)) {
+      options.graphOptimizationLevel = sidecar.graph_optimization_level;
+    }
+  } catch (error) {
+    console.warn(`⚠️  Ignoring invalid session options at ${sidecarPath}:`, error);
+  }
+  return options;
+}
+
+/**
+ * Run one inference on a blank image so kernel selection and arena
+ * allocation happen at startup rather than on the first user request
+ */
+async function warmUpSession(session: ort.InferenceSession, sessionName: string): Promise<void> {
+  try {
+    // Same shape preprocessImage() produces, so the warmed-up plan is the one served
+    const dummyInput = new Tensor(
+      'float32',
+      new Float32Array(3 * IMAGE_SIZE * IMAGE_SIZE),
+      [1, 3, IMAGE_SIZE, IMAGE_SIZE]
+    );
+    await session.run({ [session.inputNames[0]]: dummyInput });
+  } catch (error) {
+    console.warn(`⚠️  ${sessionName} model warm-up failed:`, error);
+  }
+}
+
 /**
  * Load ONNX model session (lazy loading)
  */
@@ -25,10 +113,13 @@ async function loadModel(modelPath: string, sessionName: string): Promise<ort.In
   }
 
   try {
-    const session = await ort.InferenceSession.create(modelPath, {
-      executionProviders: ['cpu'], // Use CPU (can add 'cuda' if GPU available)
-    });
-    console.log(`✅ Loaded ${sessionName} model`);
+    const resolvedPath = resolveModelPath(modelPath);
+    // .opt.onnx is saved at the portable 'extended' level; keeping the sidecar's 'all'
+    // still applies the hardware-specific layout transforms for this machine, and
+    // re-running the earlier passes on an already-optimized graph is cheap
+    const session = await ort.InferenceSession.create(resolvedPath, loadSessionOptions(modelPath));
+    console.log(`✅ Loaded ${sessionName} model (${basename(resolvedPath)})`);
+    await warmUpSession(session, sessionName);
     return session;
   } catch (error) {
     console.error(`❌ Error loading ${sessionName} model:`, error);
@@ -36,10 +127,22 @@ async function loadModel(modelPath: string, sessionName: string): Promise<ort.In
   }
 }
 
+// Resolves once initializeModels() has finished loading every session
+let modelsReady: Promise<void> | null = null;
+
 /**
  * Initialize all ML models
+ * Safe to call more than once; classify() waits on the same load, so the
+ * server can start accepting requests while models are still loading
  */
-export async function initializeModels(): Promise<void> {
+export function initializeModels(): Promise<void> {
+  if (!modelsReady) {
+    modelsReady = loadAllModels();
+  }
+  return modelsReady;
+}
+
+async function loadAllModels(): Promise<void> {
   console.log('🔧 Initializing ML models...');
   
   // Try to load models (prefer efficientnet_b0, fallback to others)
@@ -107,6 +210,9 @@ export async function initializeModels(): Promise<void> {
   }
 }
 
+// Concurrent requests against the same session are batched together
+const batchers = new Map<ort.InferenceSession, MicroBatcher>();
+
 /**
  * Run inference on an ONNX model
  */
@@ -119,33 +225,56 @@ async function runInference(
   }
 
   try {
-    // Get input/output names from the model
-    const inputName = session.inputNames[0];
-    const outputName = session.outputNames[0];
-    
-    const results = await session.run({ [inputName]: inputTensor });
-    const output = results[outputName];
-    
-    if (output && output.data) {
-      const data = output.data as Float32Array;
-      console.log(`🔍 Model output shape: [${output.dims.join(', ')}], length: ${data.length}`);
-      return data;
+    let batcher = batchers.get(session);
+    if (!batcher) {
+      batcher = new MicroBatcher(session);
+      batchers.set(session, batcher);
     }
-    return null;
+    return await batcher.run(inputTensor);
   } catch (error) {
     console.error('❌ Inference error:', error);
     return null;
   }
 }
 
+/**
+ * Accept either an image path or an already-preprocessed tensor, so
+ * classify() can decode the image once and share it across all models
+ */
+async function toInputTensor(image: string | Tensor): Promise<Tensor> {
+  if (typeof image !== 'string') {
+    return image;
+  }
+
+  try {
+    return await preprocessImage(image);
+  } catch (error: any) {
+    console.error('❌ Image preprocessing failed:', error);
+    throw new Error(`Image preprocessing failed: ${error.message}`);
+  }
+}
+
 /**
  * Apply softmax to logits
  */
 function softmax(logits: Float32Array): Float32Array {
-  const max = Math.max(...Array.from(logits));
-  const exp = logits.map(x => Math.exp(x - max));
-  const sum = exp.reduce((a, b) => a + b, 0);
-  return new Float32Array(exp.map(x => x / sum));
+  // One output buffer, no intermediate arrays (the old version spread the
+  // logits into a JS array and allocated three more typed arrays per call)
+  let max = -Infinity;
+  for (let i = 0; i < logits.length; i++) {
+    if (logits[i] > max) max = logits[i];
+  }
+
+  const probs = new Float32Array(logits.length);
+  let sum = 0;
+  for (let i = 0; i < logits.length; i++) {
+    probs[i] = Math.exp(logits[i] - max);
+    sum += probs[i];
+  }
+  for (let i = 0; i < probs.length; i++) {
+    probs[i] /= sum;
+  }
+  return probs;
 }
 
 /**
@@ -160,19 +289,13 @@ export interface BinaryResult {
   };
 }
 
-export async function predictBinary(imagePath: string): Promise<BinaryResult | null> {
+export async function predictBinary(image: string | Tensor): Promise<BinaryResult | null> {
   if (!binarySession) {
     console.error('❌ Binary model session not loaded');
     return null;
   }
 
-  let inputTensor: Tensor;
-  try {
-    inputTensor = await preprocessImage(imagePath);
-  } catch (error: any) {
-    console.error('❌ Image preprocessing failed:', error);
-    throw new Error(`Image preprocessing failed: ${error.message}`);
-  }
+  const inputTensor = await toInputTensor(image);
 
   const logits = await runInference(binarySession, inputTensor);
 
@@ -183,8 +306,10 @@ export async function predictBinary(imagePath: string): Promise<BinaryResult | n
   const probs = softmax(logits);
   
   // Debug: log raw outputs
-  console.log(`🔍 Binary classification raw logits: [${Array.from(logits).map(x => x.toFixed(3)).join(', ')}]`);
-  console.log(`🔍 Binary classification probabilities: [${Array.from(probs).map(x => x.toFixed(3)).join(', ')}]`);
+  if (DEBUG_INFERENCE) {
+    console.log(`🔍 Binary classification raw logits: [${Array.from(logits).map(x => x.toFixed(3)).join(', ')}]`);
+    console.log(`🔍 Binary classification probabilities: [${Array.from(probs).map(x => x.toFixed(3)).join(', ')}]`);
+  }
   
   // Binary model output interpretation:
   // Based on training: label 0 = no acne, label 1 = has acne
@@ -215,8 +340,10 @@ export async function predictBinary(imagePath: string): Promise<BinaryResult | n
   // Confidence is the probability of the predicted class
   const confidence = predictedClass === 1 ? hasAcneProb : noAcneProb;
 
-  console.log(`🔍 Binary prediction: class=${predictedClass} (${predictedClass === 1 ? 'hasAcne' : 'noAcne'}), confidence=${confidence.toFixed(3)}`);
-  console.log(`🔍 Binary probabilities: noAcne=${noAcneProb.toFixed(3)}, hasAcne=${hasAcneProb.toFixed(3)}`);
+  if (DEBUG_INFERENCE) {
+    console.log(`🔍 Binary prediction: class=${predictedClass} (${predictedClass === 1 ? 'hasAcne' : 'noAcne'}), confidence=${confidence.toFixed(3)}`);
+    console.log(`🔍 Binary probabilities: noAcne=${noAcneProb.toFixed(3)}, hasAcne=${hasAcneProb.toFixed(3)}`);
+  }
 
   return {
     hasAcne: predictedClass === 1,
@@ -240,19 +367,13 @@ export interface SeverityResult {
 
 const SEVERITY_LABELS = ['mild', 'moderate', 'severe', 'very_severe'];
 
-export async function predictSeverity(imagePath: string): Promise<SeverityResult | null> {
+export async function predictSeverity(image: string | Tensor): Promise<SeverityResult | null> {
   if (!severitySession) {
     console.error('❌ Severity model session not loaded');
     return null;
   }
 
-  let inputTensor: Tensor;
-  try {
-    inputTensor = await preprocessImage(imagePath);
-  } catch (error: any) {
-    console.error('❌ Image preprocessing failed:', error);
-    throw new Error(`Image preprocessing failed: ${error.message}`);
-  }
+  const inputTensor = await toInputTensor(image);
 
   const logits = await runInference(severitySession, inputTensor);
 
@@ -263,9 +384,11 @@ export async function predictSeverity(imagePath: string): Promise<SeverityResult
   const probs = softmax(logits);
   
   // Debug: log raw outputs
-  console.log(`🔍 Severity classification raw logits: [${Array.from(logits).map(x => x.toFixed(3)).join(', ')}]`);
-  console.log(`🔍 Severity classification probabilities: [${Array.from(probs).map(x => x.toFixed(3)).join(', ')}]`);
-  console.log(`🔍 Severity label mapping: ${SEVERITY_LABELS.map((l, i) => `${i}=${l}`).join(', ')}`);
+  if (DEBUG_INFERENCE) {
+    console.log(`🔍 Severity classification raw logits: [${Array.from(logits).map(x => x.toFixed(3)).join(', ')}]`);
+    console.log(`🔍 Severity classification probabilities: [${Array.from(probs).map(x => x.toFixed(3)).join(', ')}]`);
+    console.log(`🔍 Severity label mapping: ${SEVERITY_LABELS.map((l, i) => `${i}=${l}`).join(', ')}`);
+  }
   
   let maxIdx = 0;
   let maxProb = probs[0];
@@ -281,7 +404,9 @@ export async function predictSeverity(imagePath: string): Promise<SeverityResult
     allScores[label] = probs[idx];
   });
 
-  console.log(`🔍 Severity prediction: index=${maxIdx}, severity=${SEVERITY_LABELS[maxIdx]}, confidence=${maxProb.toFixed(3)}`);
+  if (DEBUG_INFERENCE) {
+    console.log(`🔍 Severity prediction: index=${maxIdx}, severity=${SEVERITY_LABELS[maxIdx]}, confidence=${maxProb.toFixed(3)}`);
+  }
 
   return {
     severity: SEVERITY_LABELS[maxIdx],
@@ -303,19 +428,13 @@ export interface TypeResult {
 
 const TYPE_LABELS = ['Pustula', 'blackhead', 'cysts', 'nodules', 'papules', 'whitehead'];
 
-export async function predictType(imagePath: string): Promise<TypeResult | null> {
+export async function predictType(image: string | Tensor): Promise<TypeResult | null> {
   if (!typeSession) {
     console.error('❌ Type model session not loaded');
     return null;
   }
 
-  let inputTensor: Tensor;
-  try {
-    inputTensor = await preprocessImage(imagePath);
-  } catch (error: any) {
-    console.error('❌ Image preprocessing failed:', error);
-    throw new Error(`Image preprocessing failed: ${error.message}`);
-  }
+  const inputTensor = await toInputTensor(image);
 
   const logits = await runInference(typeSession, inputTensor);
 
@@ -326,9 +445,11 @@ export async function predictType(imagePath: string): Promise<TypeResult | null>
   const probs = softmax(logits);
   
   // Debug: log raw outputs
-  console.log(`🔍 Type classification raw logits: [${Array.from(logits).map(x => x.toFixed(3)).join(', ')}]`);
-  console.log(`🔍 Type classification probabilities: [${Array.from(probs).map(x => x.toFixed(3)).join(', ')}]`);
-  console.log(`🔍 Type label mapping: ${TYPE_LABELS.map((l, i) => `${i}=${l}`).join(', ')}`);
+  if (DEBUG_INFERENCE) {
+    console.log(`🔍 Type classification raw logits: [${Array.from(logits).map(x => x.toFixed(3)).join(', ')}]`);
+    console.log(`🔍 Type classification probabilities: [${Array.from(probs).map(x => x.toFixed(3)).join(', ')}]`);
+    console.log(`🔍 Type label mapping: ${TYPE_LABELS.map((l, i) => `${i}=${l}`).join(', ')}`);
+  }
   
   let maxIdx = 0;
   let maxProb = probs[0];
@@ -344,7 +465,9 @@ export async function predictType(imagePath: string): Promise<TypeResult | null>
     allScores[label] = probs[idx];
   });
 
-  console.log(`🔍 Type prediction: index=${maxIdx}, type=${TYPE_LABELS[maxIdx]}, confidence=${maxProb.toFixed(3)}`);
+  if (DEBUG_INFERENCE) {
+    console.log(`🔍 Type prediction: index=${maxIdx}, type=${TYPE_LABELS[maxIdx]}, confidence=${maxProb.toFixed(3)}`);
+  }
 
   return {
     type: TYPE_LABELS[maxIdx],
@@ -370,10 +493,14 @@ export interface ClassificationResult {
 }
 
 export async function classify(imagePath: string): Promise<ClassificationResult | null> {
+  // Decode and preprocess once (overlapping any model load still in
+  // progress); all three stages share the same input
+  const [inputTensor] = await Promise.all([toInputTensor(imagePath), initializeModels()]);
+
   // Stage 1: Binary classification
   let binaryResult;
   try {
-    binaryResult = await predictBinary(imagePath);
+    binaryResult = await predictBinary(inputTensor);
     if (!binaryResult) {
       console.error('❌ Binary classification returned null');
       return null;
@@ -398,29 +525,33 @@ export async function classify(imagePath: string): Promise<ClassificationResult
     };
   }
 
+  // Stages 2 and 3 both read the same preprocessed tensor and don't depend
+  // on each other, so run them concurrently
+  const [severityOutcome, typeOutcome] = await Promise.allSettled([
+    predictSeverity(inputTensor),
+    predictType(inputTensor),
+  ]);
+
   // Stage 2: Severity classification
-  let severityResult;
-  try {
-    severityResult = await predictSeverity(imagePath);
-    if (!severityResult) {
-      console.error('❌ Severity classification returned null');
-      return null;
-    }
-  } catch (error: any) {
-    console.error('❌ Severity classification error:', error);
-    throw error;
+  if (severityOutcome.status === 'rejected') {
+    console.error('❌ Severity classification error:', severityOutcome.reason);
+    throw severityOutcome.reason;
+  }
+  const severityResult = severityOutcome.value;
+  if (!severityResult) {
+    console.error('❌ Severity classification returned null');
+    return null;
   }
 
-  // Stage 3: Type classification
+  // Stage 3: Type classification (optional, severity is required)
   let typeResult: TypeResult | null = null;
-  try {
-    typeResult = await predictType(imagePath);
+  if (typeOutcome.status === 'rejected') {
+    console.warn('⚠️  Type classification error, continuing without type:', typeOutcome.reason);
+  } else {
+    typeResult = typeOutcome.value;
     if (!typeResult) {
       console.warn('⚠️  Type classification returned null, continuing without type');
     }
-  } catch (error: any) {
-    console.warn('⚠️  Type classification error, continuing without type:', error);
-    // Don't throw - type is optional, severity is required
   }
 
   // Combine all scores
@@ -1,8 +1,15 @@
 import { AppDataSource } from '../database/connection';
 import { Prescription } from '../models/Prescription';
 import { Diagnosis } from '../models/Diagnosis';
-import { v4 as uuidv4 } from 'uuid';
-import { generatePrescriptionWithGemini, translatePrescriptionWithGemini } from './geminiService';
+import { uuidv7 } from '../utils/id';
+import { ListCursor, afterCursorSql, cursorTimestampSql } from '../utils/cursor';
+import { TTLCache } from '../utils/ttlCache';
+import {
+  generatePrescriptionWithGemini,
+  translatePrescriptionWithGemini,
+  translatePrescriptionsWithGemini,
+  PrescriptionContent,
+} from './geminiService';
 
 // Treatment guidelines (rule-based)
 const TREATMENT_DB: Record<string, any> = {
@@ -175,25 +182,26 @@ function generatePrescriptionFallback(
   reasoning: string;
 } {
   const guidelines = TREATMENT_DB[severity] || TREATMENT_DB.mild;
-  const allergies = (clinicalMetadata.allergies || []) as string[];
+  // Lowercase allergies once per call rather than once per medication
+  const allergies = ((clinicalMetadata.allergies || []) as string[])
+    .map((a) => a.toLowerCase())
+    .filter((a) => a.length > 0);
 
   // Build medications list (filter by allergies)
   const medications: any[] = [];
-  
-  for (const med of guidelines.topical) {
-    const medName = typeof med === 'string' ? med : med.name;
-    const hasAllergy = allergies.some(a => medName.toLowerCase().includes(a.toLowerCase()));
-    if (!hasAllergy) {
-      medications.push(typeof med === 'string' ? { name: med, type: 'topical' } : med);
+  const addUnlessAllergic = (med: any, type: 'topical' | 'oral') => {
+    const medName: string = typeof med === 'string' ? med : med.name;
+    const medNameLower = medName.toLowerCase();
+    if (!allergies.some((a) => medNameLower.includes(a))) {
+      medications.push(typeof med === 'string' ? { name: med, type } : med);
     }
-  }
+  };
 
+  for (const med of guidelines.topical) {
+    addUnlessAllergic(med, 'topical');
+  }
   for (const med of guidelines.oral) {
-    const medName = typeof med === 'string' ? med : med.name;
-    const hasAllergy = allergies.some(a => medName.toLowerCase().includes(a.toLowerCase()));
-    if (!hasAllergy) {
-      medications.push(typeof med === 'string' ? { name: med, type: 'oral' } : med);
-    }
+    addUnlessAllergic(med, 'oral');
   }
 
   // Generate reasoning
@@ -235,7 +243,7 @@ export async function createPrescription(
   const prescriptionRepository = AppDataSource.getRepository(Prescription);
 
   const prescription = prescriptionRepository.create({
-    id: uuidv4().substring(0, 8),
+    id: uuidv7(),
     userId,
     diagnosisId,
     severity,
@@ -249,7 +257,25 @@ export async function createPrescription(
     doctorNotes: null,
   });
 
-  await prescriptionRepository.save(prescription);
+  // Single INSERT ... ON CONFLICT DO NOTHING RETURNING: no existence SELECT,
+  // and a concurrent request for the same diagnosis cannot create a duplicate
+  const result = await prescriptionRepository
+    .createQueryBuilder()
+    .insert()
+    .values(prescription)
+    .orIgnore()
+    .execute();
+
+  if (result.raw.length === 0) {
+    const existing = await getPrescriptionByDiagnosisId(diagnosisId, userId);
+    if (!existing) {
+      // The conflicting row belongs to another user or was deleted in between;
+      // nothing was written, so don't hand back the unsaved entity
+      throw new Error('Prescription was not created: a conflicting prescription exists for this diagnosis');
+    }
+    return existing;
+  }
+
   return prescription;
 }
 
@@ -280,16 +306,263 @@ export async function getPrescriptionByDiagnosisId(
 }
 
 /**
- * List prescriptions for a user
+ * Get a user's diagnosis together with its prescription (if any) in one query
  */
-export async function listPrescriptions(userId: string): Promise<Prescription[]> {
-  const prescriptionRepository = AppDataSource.getRepository(Prescription);
-  return prescriptionRepository.find({
-    where: { userId },
-    order: { createdAt: 'DESC' },
+export async function getDiagnosisWithPrescription(
+  diagnosisId: string,
+  userId: string
+): Promise<{ diagnosis: Diagnosis | null; prescription: Prescription | null }> {
+  const diagnosis = await AppDataSource.getRepository(Diagnosis)
+    .createQueryBuilder('diagnosis')
+    .leftJoinAndSelect('diagnosis.prescriptions', 'prescription', 'prescription.userId = diagnosis.userId')
+    .where('diagnosis.id = :diagnosisId', { diagnosisId })
+    .andWhere('diagnosis.userId = :userId', { userId })
+    .getOne();
+
+  return {
+    diagnosis,
+    prescription: diagnosis?.prescriptions[0] ?? null,
+  };
+}
+
+/**
+ * Prescription list row: the large text fields (reasoning, follow-up and
+ * lifestyle advice) are left to the detail endpoint
+ */
+export interface PrescriptionListRow {
+  id: string;
+  diagnosisId: string | null;
+  severity: string;
+  medications: Record<string, any>[];
+  status: string;
+  doctorNotes: string | null;
+  approvedAt: Date | null;
+  createdAt: Date;
+  cursorCreatedAt: string;
+}
+
+/**
+ * List prescriptions for a user, newest first
+ * With a limit, fetches limit + 1 rows (see toPage) after the optional cursor;
+ * without one, returns every row
+ */
+export async function listPrescriptions(
+  userId: string,
+  limit?: number,
+  cursor?: ListCursor
+): Promise<PrescriptionListRow[]> {
+  const query = AppDataSource.getRepository(Prescription)
+    .createQueryBuilder('p')
+    .select([
+      'p.id AS "id"',
+      'p.diagnosis_id AS "diagnosisId"',
+      'p.severity AS "severity"',
+      'p.medications AS "medications"',
+      'p.status AS "status"',
+      'p.doctor_notes AS "doctorNotes"',
+      'p.approved_at AS "approvedAt"',
+      'p.created_at AS "createdAt"',
+      `${cursorTimestampSql('p.created_at')} AS "cursorCreatedAt"`,
+    ])
+    .where('p.user_id = :userId', { userId });
+
+  if (cursor) {
+    query.andWhere(afterCursorSql('p.created_at', 'p.id'), {
+      cursorCreatedAt: cursor.createdAt,
+      cursorId: cursor.id,
+    });
+  }
+
+  // id breaks ties between rows sharing a created_at (e.g. one multi-row INSERT)
+  query.orderBy('p.created_at', 'DESC').addOrderBy('p.id', 'DESC');
+  if (limit !== undefined) {
+    query.limit(limit + 1);
+  }
+
+  return query.getRawMany<PrescriptionListRow>();
+}
+
+// Concurrent translation requests for the same language are coalesced into
+// one Gemini call (up to TRANSLATION_MAX_BATCH, waiting at most TRANSLATION_MAX_DELAY_MS)
+const TRANSLATION_MAX_BATCH = 8;
+const TRANSLATION_MAX_DELAY_MS = 50;
+
+interface PendingTranslation {
+  content: PrescriptionContent;
+  resolve: (translated: PrescriptionContent) => void;
+  reject: (error: unknown) => void;
+}
+
+const translationQueues: Record<'hi' | 'te', PendingTranslation[]> = { hi: [], te: [] };
+const translationTimers: Record<'hi' | 'te', NodeJS.Timeout | null> = { hi: null, te: null };
+
+function flushTranslations(targetLanguage: 'hi' | 'te'): void {
+  const timer = translationTimers[targetLanguage];
+  if (timer) {
+    clearTimeout(timer);
+    translationTimers[targetLanguage] = null;
+  }
+
+  const batch = translationQueues[targetLanguage].splice(0, TRANSLATION_MAX_BATCH);
+  if (translationQueues[targetLanguage].length > 0) {
+    translationTimers[targetLanguage] = setTimeout(
+      () => flushTranslations(targetLanguage),
+      TRANSLATION_MAX_DELAY_MS
+    );
+  }
+  if (batch.length === 0) {
+    return;
+  }
+
+  translatePrescriptionsWithGemini(batch.map((item) => item.content), targetLanguage)
+    .then((translated) => batch.forEach((item, i) => item.resolve(translated[i])))
+    .catch((error) => {
+      if (batch.length === 1) {
+        batch[0].reject(error);
+        return;
+      }
+
+      // The batch mixes unrelated requests; one malformed reply (e.g. a short array)
+      // shouldn't send all of them to the dictionary fallback, so retry each on its own
+      console.warn(`⚠️  Batched translation of ${batch.length} prescriptions failed, retrying individually:`, error);
+      for (const item of batch) {
+        translatePrescriptionWithGemini(item.content, targetLanguage).then(item.resolve, item.reject);
+      }
+    });
+}
+
+function queueTranslation(
+  content: PrescriptionContent,
+  targetLanguage: 'hi' | 'te'
+): Promise<PrescriptionContent> {
+  return new Promise((resolve, reject) => {
+    translationQueues[targetLanguage].push({ content, resolve, reject });
+
+    if (translationQueues[targetLanguage].length >= TRANSLATION_MAX_BATCH) {
+      flushTranslations(targetLanguage);
+    } else if (!translationTimers[targetLanguage]) {
+      translationTimers[targetLanguage] = setTimeout(
+        () => flushTranslations(targetLanguage),
+        TRANSLATION_MAX_DELAY_MS
+      );
+    }
   });
 }
 
+// Translation memory: prescriptions reuse the same boilerplate phrases
+// ("Apply thin layer", "Avoid sun exposure"), so every translated text field
+// is remembered per language and fully-known prescriptions skip Gemini
+const TRANSLATION_MEMORY = new TTLCache<string, string>(4096, 24 * 60 * 60 * 1000);
+
+function memoryKey(segment: string, targetLanguage: 'hi' | 'te'): string {
+  return `${targetLanguage}:${segment.trim().replace(/\s+/g, ' ').toLowerCase()}`;
+}
+
+/**
+ * Rebuild a value with every non-blank string replaced by replace(string)
+ */
+function mapSegments(value: any, replace: (segment: string) => string): any {
+  if (typeof value === 'string') {
+    return value.trim() ? replace(value) : value;
+  }
+  if (Array.isArray(value)) {
+    return value.map((item) => mapSegments(item, replace));
+  }
+  if (value && typeof value === 'object') {
+    return Object.fromEntries(
+      Object.entries(value).map(([key, item]) => [key, mapSegments(item, replace)])
+    );
+  }
+  return value;
+}
+
+/**
+ * Translate content entirely from memory, or return null on any miss
+ */
+function lookupTranslation(
+  content: PrescriptionContent,
+  targetLanguage: 'hi' | 'te'
+): PrescriptionContent | null {
+  let complete = true;
+  const translated = mapSegments(content, (segment) => {
+    const hit = TRANSLATION_MEMORY.get(memoryKey(segment, targetLanguage));
+    if (hit === undefined) {
+      complete = false;
+      return segment;
+    }
+    return hit;
+  });
+  return complete ? translated : null;
+}
+
+/**
+ * Store source -> translated pairs, walking both structures together
+ * (only where the model kept the shape, so segments stay aligned)
+ */
+function rememberTranslation(original: any, translated: any, targetLanguage: 'hi' | 'te'): void {
+  if (typeof original === 'string') {
+    if (original.trim() && typeof translated === 'string') {
+      TRANSLATION_MEMORY.set(memoryKey(original, targetLanguage), translated);
+    }
+  } else if (Array.isArray(original)) {
+    if (Array.isArray(translated) && translated.length === original.length) {
+      original.forEach((item, i) => rememberTranslation(item, translated[i], targetLanguage));
+    }
+  } else if (original && typeof original === 'object' && translated && typeof translated === 'object') {
+    for (const key of Object.keys(original)) {
+      rememberTranslation(original[key], translated[key], targetLanguage);
+    }
+  }
+}
+
+// Simple phrase dictionaries – can be replaced by a proper translation service later
+const TELUGU_TERMS: Record<string, string> = {
+  'apply': 'రాయకండి',
+  'take': 'తీసుకోండి',
+  'daily': 'రోజూ',
+  'twice daily': 'రోజుకు రెండుసార్లు',
+  'once daily': 'రోజుకు ఒకసారి',
+  'at night': 'రాత్రి',
+  'morning': 'ఉదయం',
+  'evening': 'సాయంత్రం',
+  'with food': 'ఆహారంతో',
+  'weeks': 'వారాలు',
+  'months': 'నెలలు',
+};
+
+const HINDI_TERMS: Record<string, string> = {
+  'apply': 'लगाएं',
+  'take': 'लें',
+  'daily': 'रोजाना',
+  'twice daily': 'दिन में दो बार',
+  'once daily': 'दिन में एक बार',
+  'at night': 'रात में',
+  'morning': 'सुबह',
+  'evening': 'शाम',
+  'with food': 'खाने के साथ',
+  'weeks': 'हफ्ते',
+  'months': 'महीने',
+};
+
+/**
+ * Compile a phrase dictionary into one case-insensitive alternation,
+ * longest phrase first so "twice daily" wins over "daily"
+ */
+function compilePhraseDictionary(terms: Record<string, string>): {
+  pattern: RegExp;
+  terms: Record<string, string>;
+} {
+  const phrases = Object.keys(terms)
+    .sort((a, b) => b.length - a.length)
+    .map((phrase) => phrase.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'));
+  return { pattern: new RegExp(phrases.join('|'), 'gi'), terms };
+}
+
+const PHRASE_DICTIONARIES = {
+  te: compilePhraseDictionary(TELUGU_TERMS),
+  hi: compilePhraseDictionary(HINDI_TERMS),
+};
+
 /**
  * Translate prescription content to a target language.
  * Uses Gemini when available for full-text translation, with a simple
@@ -315,16 +588,20 @@ export async function translatePrescription(
 
   // Try Gemini translation first for hi/te
   if (targetLanguage === 'hi' || targetLanguage === 'te') {
-    try {
-      const translated = await translatePrescriptionWithGemini(
-        {
-          medications,
-          lifestyleRecommendations: recommendations,
-          followUpInstructions: instructions,
-        },
-        targetLanguage
-      );
+    const content: PrescriptionContent = {
+      medications,
+      lifestyleRecommendations: recommendations,
+      followUpInstructions: instructions,
+    };
+
+    const remembered = lookupTranslation(content, targetLanguage);
+    if (remembered) {
+      return remembered;
+    }
 
+    try {
+      const translated = await queueTranslation(content, targetLanguage);
+      rememberTranslation(content, translated, targetLanguage);
       return translated;
     } catch (error) {
       // Fallback to simple dictionary below
@@ -333,44 +610,12 @@ export async function translatePrescription(
     }
   }
 
-  // Simple phrase dictionaries – can be replaced by a proper translation service later
-  const teluguTerms: Record<string, string> = {
-    'apply': 'రాయకండి',
-    'take': 'తీసుకోండి',
-    'daily': 'రోజూ',
-    'twice daily': 'రోజుకు రెండుసార్లు',
-    'once daily': 'రోజుకు ఒకసారి',
-    'at night': 'రాత్రి',
-    'morning': 'ఉదయం',
-    'evening': 'సాయంత్రం',
-    'with food': 'ఆహారంతో',
-    'weeks': 'వారాలు',
-    'months': 'నెలలు',
-  };
-
-  const hindiTerms: Record<string, string> = {
-    'apply': 'लगाएं',
-    'take': 'लें',
-    'daily': 'रोजाना',
-    'twice daily': 'दिन में दो बार',
-    'once daily': 'दिन में एक बार',
-    'at night': 'रात में',
-    'morning': 'सुबह',
-    'evening': 'शाम',
-    'with food': 'खाने के साथ',
-    'weeks': 'हफ्ते',
-    'months': 'महीने',
-  };
-
-  const terms = targetLanguage === 'te' ? teluguTerms : hindiTerms;
+  const { pattern, terms } = PHRASE_DICTIONARIES[targetLanguage];
 
+  // One pass per string: the alternation matches the longest phrase first
   const translateText = (text: string): string => {
     if (!text) return text;
-    let translated = text;
-    Object.entries(terms).forEach(([en, localized]) => {
-      translated = translated.replace(new RegExp(en, 'gi'), localized);
-    });
-    return translated;
+    return text.replace(pattern, (match) => terms[match.toLowerCase()]);
   };
 
   const translatedMedications = medications.map((med) => ({
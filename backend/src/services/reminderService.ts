@@ -1,6 +1,7 @@
 import { AppDataSource } from '../database/connection';
 import { Reminder } from '../models/Reminder';
-import { v4 as uuidv4 } from 'uuid';
+import { uuidv7 } from '../utils/id';
+import { ListCursor, afterCursorSql, cursorTimestampSql } from '../utils/cursor';
 
 /**
  * Create a reminder
@@ -19,7 +20,7 @@ export async function createReminder(
   const reminderRepository = AppDataSource.getRepository(Reminder);
 
   const reminder = reminderRepository.create({
-    id: uuidv4().substring(0, 8),
+    id: uuidv7(),
     userId,
     prescriptionId: data.prescriptionId || null,
     title: data.title,
@@ -35,6 +36,46 @@ export async function createReminder(
   return reminder;
 }
 
+/**
+ * Create several reminders with a single INSERT
+ */
+export async function createReminders(
+  userId: string,
+  dataList: {
+    prescriptionId?: string;
+    title: string;
+    message: string;
+    messageTelugu?: string;
+    frequency: string;
+    times: string[];
+  }[]
+): Promise<Reminder[]> {
+  if (dataList.length === 0) {
+    return [];
+  }
+
+  const reminderRepository = AppDataSource.getRepository(Reminder);
+
+  const reminders = dataList.map((data) =>
+    reminderRepository.create({
+      id: uuidv7(),
+      userId,
+      prescriptionId: data.prescriptionId || null,
+      title: data.title,
+      message: data.message,
+      messageTelugu: data.messageTelugu || null,
+      frequency: data.frequency,
+      times: data.times,
+      status: 'active',
+      totalAcknowledged: 0,
+    })
+  );
+
+  // insert() skips save()'s per-entity existence SELECT and transaction
+  await reminderRepository.insert(reminders);
+  return reminders;
+}
+
 /**
  * Get reminder by ID
  */
@@ -49,14 +90,63 @@ export async function getReminderById(
 }
 
 /**
- * List reminders for a user
+ * Reminder list row: the columns the list endpoint returns, as plain objects
  */
-export async function listReminders(userId: string): Promise<Reminder[]> {
-  const reminderRepository = AppDataSource.getRepository(Reminder);
-  return reminderRepository.find({
-    where: { userId },
-    order: { createdAt: 'DESC' },
-  });
+export interface ReminderListRow {
+  id: string;
+  prescriptionId: string | null;
+  title: string;
+  message: string;
+  messageTelugu: string | null;
+  frequency: string;
+  times: string[];
+  status: string;
+  totalAcknowledged: number;
+  createdAt: Date;
+  cursorCreatedAt: string;
+}
+
+/**
+ * List reminders for a user, newest first
+ * With a limit, fetches limit + 1 rows (see toPage) after the optional cursor;
+ * without one, returns every row
+ */
+export async function listReminders(
+  userId: string,
+  limit?: number,
+  cursor?: ListCursor
+): Promise<ReminderListRow[]> {
+  const query = AppDataSource.getRepository(Reminder)
+    .createQueryBuilder('r')
+    .select([
+      'r.id AS "id"',
+      'r.prescription_id AS "prescriptionId"',
+      'r.title AS "title"',
+      'r.message AS "message"',
+      'r.message_telugu AS "messageTelugu"',
+      'r.frequency AS "frequency"',
+      'r.times AS "times"',
+      'r.status AS "status"',
+      'r.total_acknowledged AS "totalAcknowledged"',
+      'r.created_at AS "createdAt"',
+      `${cursorTimestampSql('r.created_at')} AS "cursorCreatedAt"`,
+    ])
+    .where('r.user_id = :userId', { userId });
+
+  if (cursor) {
+    query.andWhere(afterCursorSql('r.created_at', 'r.id'), {
+      cursorCreatedAt: cursor.createdAt,
+      cursorId: cursor.id,
+    });
+  }
+
+  // id breaks ties between rows sharing a created_at (e.g. one multi-row INSERT)
+  query.orderBy('r.created_at', 'DESC').addOrderBy('r.id', 'DESC');
+  if (limit !== undefined) {
+    query.limit(limit + 1);
+  }
+
+  return query.getRawMany<ReminderListRow>();
 }
 
 /**
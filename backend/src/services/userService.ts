@@ -1,6 +1,33 @@
 import { AppDataSource } from '../database/connection';
 import { User } from '../models/User';
-import { hashPassword, verifyPassword } from '../utils/password';
+import { isUuid } from '../utils/id';
+import { hashPassword, needsRehash, verifyPassword } from '../utils/password';
+import { TTLCache } from '../utils/ttlCache';
+
+/**
+ * A user as attached to authenticated requests: everything but the password hash
+ */
+export type PublicUser = Omit<User, 'passwordHash'>;
+
+// Every authenticated request resolves its user by id; a short per-process TTL keeps
+// bursts from one client off the database. Writes below invalidate the local entry;
+// the TTL bounds how long a change made elsewhere (another instance, a role granted
+// in SQL) can go unseen. Entries are frozen and handed out as copies, so one
+// request can't alter the user another request sees.
+const userCache = new TTLCache<string, Readonly<PublicUser>>(1024, 5 * 1000);
+
+function toPublicUser(user: User): PublicUser {
+  const { passwordHash, ...publicUser } = user;
+  return publicUser;
+}
+
+/**
+ * Drop a user's cached entry; call after changing the user (e.g. their role)
+ * outside the functions below
+ */
+export function invalidateUserCache(userId: string): void {
+  userCache.delete(userId);
+}
 
 /**
  * Create a new user
@@ -17,15 +44,6 @@ export async function createUser(
 ): Promise<User> {
   const userRepository = AppDataSource.getRepository(User);
 
-  // Check if user already exists
-  const existingUser = await userRepository.findOne({
-    where: { email: email.toLowerCase() },
-  });
-
-  if (existingUser) {
-    throw new Error('Email already registered');
-  }
-
   // Hash password
   const passwordHash = await hashPassword(password);
 
@@ -41,7 +59,18 @@ export async function createUser(
     preferences,
   });
 
-  await userRepository.save(user);
+  // Single INSERT ... ON CONFLICT DO NOTHING RETURNING: emails are stored lowercased, so the
+  // unique index on users.email rejects duplicates atomically and no row comes back
+  const result = await userRepository
+    .createQueryBuilder()
+    .insert()
+    .values(user)
+    .orIgnore()
+    .execute();
+
+  if (result.raw.length === 0) {
+    throw new Error('Email already registered');
+  }
   return user;
 }
 
@@ -56,13 +85,43 @@ export async function getUserByEmail(email: string): Promise<User | null> {
 }
 
 /**
- * Get user by ID
+ * Get user by ID (without the password hash)
  */
-export async function getUserById(userId: string): Promise<User | null> {
+export async function getUserById(userId: string): Promise<PublicUser | null> {
+  // A malformed id can't match; skip the round-trip (and Postgres' uuid cast error)
+  if (!isUuid(userId)) {
+    return null;
+  }
+
+  const cached = userCache.get(userId);
+  if (cached) {
+    return { ...cached };
+  }
+
   const userRepository = AppDataSource.getRepository(User);
-  return userRepository.findOne({
+  const user = await userRepository.findOne({
     where: { id: userId },
   });
+  if (!user) {
+    return null;
+  }
+
+  const publicUser = toPublicUser(user);
+  userCache.set(userId, Object.freeze({ ...publicUser }));
+  return publicUser;
+}
+
+/**
+ * Re-hash a verified password with the current scheme
+ */
+async function upgradePasswordHash(user: User, password: string): Promise<void> {
+  try {
+    const passwordHash = await hashPassword(password);
+    await AppDataSource.getRepository(User).update(user.id, { passwordHash });
+    invalidateUserCache(user.id);
+  } catch (error) {
+    console.error(`⚠️  Password hash upgrade failed for user ${user.id}:`, error);
+  }
 }
 
 /**
@@ -85,10 +144,26 @@ export async function authenticateUser(
     return { error: 'wrong_password' };
   }
 
+  // Upgrade legacy (truncated-input) hashes now that we have the plaintext; login doesn't wait on it
+  if (needsRehash(user.passwordHash)) {
+    void upgradePasswordHash(user, password);
+  }
+
   console.log(`✅ Login successful for email: ${email}`);
   return { user };
 }
 
+/**
+ * Map a raw users row (column names) onto a User entity (property names)
+ */
+function userFromRow(row: Record<string, any>): User {
+  const user = new User();
+  for (const column of AppDataSource.getMetadata(User).columns) {
+    (user as any)[column.propertyName] = row[column.databaseName];
+  }
+  return user;
+}
+
 /**
  * Update user information
  */
@@ -102,23 +177,33 @@ export async function updateUser(
     skinType?: string;
     preferences?: Record<string, any>;
   }
-): Promise<User | null> {
-  const userRepository = AppDataSource.getRepository(User);
-  const user = await getUserById(userId);
+): Promise<PublicUser | null> {
+  const values: Partial<User> = {};
+  if (updates.fullName !== undefined) values.fullName = updates.fullName;
+  if (updates.phone !== undefined) values.phone = updates.phone;
+  if (updates.dateOfBirth !== undefined) values.dateOfBirth = updates.dateOfBirth;
+  if (updates.gender !== undefined) values.gender = updates.gender;
+  if (updates.skinType !== undefined) values.skinType = updates.skinType;
+  if (updates.preferences !== undefined) values.preferences = updates.preferences;
+
+  if (Object.keys(values).length === 0) {
+    return getUserById(userId);
+  }
 
-  if (!user) {
+  // Single UPDATE ... RETURNING: no SELECT to load the user, nor the one save() runs to diff it
+  const result = await AppDataSource.getRepository(User)
+    .createQueryBuilder()
+    .update()
+    .set(values)
+    .where('id = :id', { id: userId })
+    .returning('*')
+    .execute();
+
+  if (result.raw.length === 0) {
     return null;
   }
 
-  // Update fields
-  if (updates.fullName !== undefined) user.fullName = updates.fullName;
-  if (updates.phone !== undefined) user.phone = updates.phone;
-  if (updates.dateOfBirth !== undefined) user.dateOfBirth = updates.dateOfBirth;
-  if (updates.gender !== undefined) user.gender = updates.gender;
-  if (updates.skinType !== undefined) user.skinType = updates.skinType;
-  if (updates.preferences !== undefined) user.preferences = updates.preferences;
-
-  await userRepository.save(user);
-  return user;
+  invalidateUserCache(userId);
+  return toPublicUser(userFromRow(result.raw[0]));
 }
 
@@ -0,0 +1,70 @@
+/**
+ * Keyset cursor for newest-first lists ordered by (created_at DESC, id DESC)
+ * createdAt is kept as Postgres-formatted text rather than a JS Date: Dates
+ * only hold milliseconds, while created_at has microseconds, so a Date cursor
+ * would skip or repeat rows created within the same millisecond.
+ */
+export interface ListCursor {
+  createdAt: string;
+  id: string;
+}
+
+// created_at rendered as UTC ISO 8601 with all six fractional digits
+const CURSOR_TIMESTAMP_FORMAT = `'YYYY-MM-DD"T"HH24:MI:SS.US"Z"'`;
+const CURSOR_TIMESTAMP_PATTERN = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}Z$/;
+
+/**
+ * SQL expression selecting a created_at column in cursor form
+ */
+export function cursorTimestampSql(column: string): string {
+  return `to_char(${column} AT TIME ZONE 'UTC', ${CURSOR_TIMESTAMP_FORMAT})`;
+}
+
+/**
+ * SQL predicate for rows after the cursor; expects :cursorCreatedAt and :cursorId
+ * A row comparison, so a (..., created_at, id) index serves it directly
+ */
+export function afterCursorSql(createdAtColumn: string, idColumn: string): string {
+  return `(${createdAtColumn}, ${idColumn}) < (CAST(:cursorCreatedAt AS timestamptz), :cursorId)`;
+}
+
+export function encodeCursor(cursor: ListCursor): string {
+  return Buffer.from(JSON.stringify([cursor.createdAt, cursor.id])).toString('base64url');
+}
+
+/**
+ * Parse a client-supplied cursor; null if it isn't one we issued
+ */
+export function decodeCursor(value: string): ListCursor | null {
+  try {
+    const decoded = JSON.parse(Buffer.from(value, 'base64url').toString('utf-8'));
+    if (
+      Array.isArray(decoded) &&
+      typeof decoded[0] === 'string' &&
+      typeof decoded[1] === 'string' &&
+      CURSOR_TIMESTAMP_PATTERN.test(decoded[0])
+    ) {
+      return { createdAt: decoded[0], id: decoded[1] };
+    }
+  } catch (error) {
+    // Fall through: malformed base64 or JSON
+  }
+  return null;
+}
+
+/**
+ * Split a page fetched with limit + 1 rows into the page and the next cursor
+ * (null once the last page has been returned)
+ */
+export function toPage<T extends { id: string; cursorCreatedAt: string }>(
+  rows: T[],
+  limit: number
+): { items: T[]; nextCursor: string | null } {
+  if (rows.length <= limit) {
+    return { items: rows, nextCursor: null };
+  }
+
+  const items = rows.slice(0, limit);
+  const last = items[items.length - 1];
+  return { items, nextCursor: encodeCursor({ createdAt: last.cursorCreatedAt, id: last.id }) };
+}
@@ -1,26 +1,63 @@
 import multer from 'multer';
 import { v4 as uuidv4 } from 'uuid';
 import { join } from 'path';
-import { existsSync, mkdirSync } from 'fs';
+import { existsSync, mkdirSync, createWriteStream, unlink } from 'fs';
+import { createHash } from 'crypto';
+import { pipeline } from 'stream';
 import { config } from '../config';
 
+declare global {
+  namespace Express {
+    namespace Multer {
+      interface File {
+        contentHash?: string; // SHA-256 of the uploaded bytes (hex)
+      }
+    }
+  }
+}
+
 // Ensure upload directory exists
 const uploadDir = config.uploadDir;
 if (!existsSync(uploadDir)) {
   mkdirSync(uploadDir, { recursive: true });
 }
 
-// Configure storage
-const storage = multer.diskStorage({
-  destination: (req, file, cb) => {
-    cb(null, uploadDir);
-  },
-  filename: (req, file, cb) => {
+/**
+ * Disk storage that hashes the upload while streaming it to disk,
+ * so the file never has to be buffered or re-read to fingerprint it
+ */
+const storage: multer.StorageEngine = {
+  _handleFile(req, file, cb) {
     const ext = file.originalname.split('.').pop() || 'jpg';
     const filename = `${uuidv4()}.${ext}`;
-    cb(null, filename);
+    const path = join(uploadDir, filename);
+    const hash = createHash('sha256');
+    let size = 0;
+
+    file.stream.on('data', (chunk: Buffer) => {
+      size += chunk.length;
+      hash.update(chunk);
+    });
+
+    pipeline(file.stream, createWriteStream(path), (error) => {
+      if (error) {
+        unlink(path, () => cb(error));
+        return;
+      }
+      cb(null, {
+        destination: uploadDir,
+        filename,
+        path,
+        size,
+        contentHash: hash.digest('hex'),
+      });
+    });
   },
-});
+
+  _removeFile(req, file, cb) {
+    unlink(file.path, (error) => cb(error));
+  },
+};
 
 // File filter for images only
 const fileFilter = (
@@ -0,0 +1,28 @@
+import { randomBytes } from 'crypto';
+
+/**
+ * Generate a UUIDv7 (RFC 9562): 48-bit millisecond timestamp followed by
+ * random bits, so ids are unique and sort by creation time
+ */
+export function uuidv7(): string {
+  const bytes = randomBytes(16);
+  const timestamp = Date.now();
+
+  // Bytes 0-5: big-endian Unix timestamp in milliseconds
+  bytes.writeUIntBE(timestamp, 0, 6);
+  // Version 7 in the high nibble of byte 6, RFC 4122 variant in byte 8
+  bytes[6] = (bytes[6] & 0x0f) | 0x70;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+
+  const hex = bytes.toString('hex');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+/**
+ * Check that a string is a canonical UUID before handing it to a uuid column
+ */
+export function isUuid(value: string): boolean {
+  return UUID_PATTERN.test(value);
+}
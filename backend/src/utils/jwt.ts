@@ -6,18 +6,26 @@ export interface TokenPayload {
   exp?: number;
 }
 
+// Built once at load; jwt.sign/verify otherwise re-derive these per call
+const TOKEN_TTL_SECONDS = config.accessTokenExpireMinutes * 60;
+const SIGN_OPTIONS: jwt.SignOptions = {
+  algorithm: config.algorithm as jwt.Algorithm,
+};
+const VERIFY_OPTIONS: jwt.VerifyOptions = {
+  algorithms: [config.algorithm as jwt.Algorithm],
+};
+
 /**
  * Create a JWT access token
  */
 export function createAccessToken(userId: string): string {
+  // Set exp directly instead of expiresIn, which jsonwebtoken parses per call
   const payload: TokenPayload = {
     sub: userId,
+    exp: Math.floor(Date.now() / 1000) + TOKEN_TTL_SECONDS,
   };
 
-  return jwt.sign(payload, config.secretKey, {
-    algorithm: config.algorithm as jwt.Algorithm,
-    expiresIn: config.accessTokenExpireMinutes * 60, // Convert minutes to seconds
-  });
+  return jwt.sign(payload, config.secretKey, SIGN_OPTIONS);
 }
 
 /**
@@ -25,9 +33,7 @@ export function createAccessToken(userId: string): string {
  */
 export function verifyToken(token: string): TokenPayload | null {
   try {
-    const decoded = jwt.verify(token, config.secretKey, {
-      algorithms: [config.algorithm as jwt.Algorithm],
-    }) as TokenPayload;
+    const decoded = jwt.verify(token, config.secretKey, VERIFY_OPTIONS) as TokenPayload;
     return decoded;
   } catch (error) {
     return null;
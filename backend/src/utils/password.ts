@@ -1,4 +1,46 @@
+import { createHmac } from 'crypto';
 import bcrypt from 'bcrypt';
+import { config } from '../config';
+
+// Marks hashes whose bcrypt input is the HMAC-SHA256 prehash rather than the raw password,
+// followed by the pepper version ("hmac-sha256$v2$<bcrypt>") so the pepper can be rotated
+const PREHASH_PREFIX = 'hmac-sha256$';
+const VERSIONED_PREHASH = /^hmac-sha256\$v(\d+)\$(.+)$/;
+// Prehash hashes written before the version was recorded used the first pepper
+const UNVERSIONED_PEPPER_VERSION = 1;
+
+function currentPrefix(): string {
+  return `${PREHASH_PREFIX}v${config.passwordPepperVersion}$`;
+}
+
+/**
+ * Pepper for a given version: the current one, or a retired one from
+ * PASSWORD_PEPPER_PREVIOUS; undefined if it is no longer configured
+ */
+function pepperFor(version: number): string | undefined {
+  if (version === config.passwordPepperVersion) {
+    return config.passwordPepper;
+  }
+  return config.previousPasswordPeppers[version];
+}
+
+/**
+ * HMAC-SHA256 the password (keyed with the pepper) into 44 base64 chars,
+ * well under bcrypt's 72-byte input limit, so long passwords are never truncated
+ */
+function prehash(password: string, pepper: string): string {
+  return createHmac('sha256', pepper).update(password, 'utf-8').digest('base64');
+}
+
+/**
+ * Bcrypt only reads the first 72 bytes; legacy hashes were made from the truncated password
+ */
+function truncateForBcrypt(password: string): string {
+  const passwordBytes = Buffer.from(password, 'utf-8');
+  return passwordBytes.length > 72
+    ? passwordBytes.subarray(0, 72).toString('utf-8')
+    : password;
+}
 
 /**
  * Hash a password using bcrypt
@@ -8,14 +50,19 @@ export async function hashPassword(password: string): Promise<string> {
     throw new Error('Password cannot be empty');
   }
 
-  // Bcrypt has a 72-byte limit, truncate if necessary
-  const passwordBytes = Buffer.from(password, 'utf-8');
-  const truncatedPassword = passwordBytes.length > 72 
-    ? passwordBytes.slice(0, 72).toString('utf-8')
-    : password;
+  // Passing the cost lets bcrypt generate the salt inside the same libuv threadpool job
+  return currentPrefix() + await bcrypt.hash(
+    prehash(password, config.passwordPepper),
+    config.bcryptRounds
+  );
+}
 
-  const salt = await bcrypt.genSalt(10);
-  return bcrypt.hash(truncatedPassword, salt);
+/**
+ * Whether a stored hash wasn't made with the current pepper (a plain bcrypt
+ * hash or an older pepper version) and should be replaced on next login
+ */
+export function needsRehash(hashedPassword: string): boolean {
+  return !hashedPassword.startsWith(currentPrefix());
 }
 
 /**
@@ -29,16 +76,20 @@ export async function verifyPassword(
     return false;
   }
 
-  // Bcrypt has a 72-byte limit, truncate if necessary
-  const passwordBytes = Buffer.from(plainPassword, 'utf-8');
-  const truncatedPassword = passwordBytes.length > 72
-    ? passwordBytes.slice(0, 72).toString('utf-8')
-    : plainPassword;
-
   try {
-    return await bcrypt.compare(truncatedPassword, hashedPassword);
+    if (!hashedPassword.startsWith(PREHASH_PREFIX)) {
+      return await bcrypt.compare(truncateForBcrypt(plainPassword), hashedPassword);
+    }
+
+    const versioned = VERSIONED_PREHASH.exec(hashedPassword);
+    const version = versioned ? parseInt(versioned[1], 10) : UNVERSIONED_PEPPER_VERSION;
+    const bcryptHash = versioned ? versioned[2] : hashedPassword.slice(PREHASH_PREFIX.length);
+    const pepper = pepperFor(version);
+    if (pepper === undefined) {
+      return false;
+    }
+    return await bcrypt.compare(prehash(plainPassword, pepper), bcryptHash);
   } catch (error) {
     return false;
   }
 }
-
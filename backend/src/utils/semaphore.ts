@@ -0,0 +1,30 @@
+/**
+ * Counting semaphore for async work: at most `limit` tasks run at once,
+ * the rest wait their turn in FIFO order
+ */
+export class Semaphore {
+  private active = 0;
+  private waiters: (() => void)[] = [];
+
+  constructor(private readonly limit: number) {}
+
+  async run<T>(task: () => Promise<T>): Promise<T> {
+    if (this.active < this.limit) {
+      this.active++;
+    } else {
+      // A finishing task hands its slot straight to us (active stays the same)
+      await new Promise<void>((resolve) => this.waiters.push(resolve));
+    }
+
+    try {
+      return await task();
+    } finally {
+      const next = this.waiters.shift();
+      if (next) {
+        next();
+      } else {
+        this.active--;
+      }
+    }
+  }
+}
@@ -0,0 +1,44 @@
+/**
+ * Small in-memory LRU cache with per-entry expiry
+ * Relies on Map preserving insertion order: the first key is the least
+ * recently used one
+ */
+export class TTLCache<K, V> {
+  private entries = new Map<K, { value: V; expiresAt: number }>();
+
+  constructor(
+    private readonly maxSize: number,
+    private readonly ttlMs: number
+  ) {}
+
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return undefined;
+    }
+
+    if (entry.expiresAt < Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+
+    // Move to the most-recently-used position
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  set(key: K, value: V): void {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+
+    if (this.entries.size > this.maxSize) {
+      const oldestKey = this.entries.keys().next().value as K;
+      this.entries.delete(oldestKey);
+    }
+  }
+
+  delete(key: K): void {
+    this.entries.delete(key);
+  }
+}
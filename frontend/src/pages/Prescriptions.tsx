@@ -11,9 +11,10 @@ interface Prescription {
   severity: string
   status: string
   medications: any[]
-  lifestyle_recommendations: string[]
-  follow_up_instructions: string
-  reasoning: string
+  // Only sent by the detail endpoint; the list response omits them
+  lifestyle_recommendations?: string[]
+  follow_up_instructions?: string
+  reasoning?: string
   doctor_notes?: string
   approved_at?: string
   created_at: string